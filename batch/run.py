@@ -0,0 +1,140 @@
+"""
+절단 · 슬리팅 배치 실행 (화면 없이)
+
+    python -m batch.run jobs/                          # 폴더: *.json 작업 명세 + *.csv/*.xlsx 절단 리스트
+    python -m batch.run manifest.json -o out/ --workers 8 --time-limit 60 --format xlsx
+
+– 작업 명세 형식은 core/jobs.py 참고. manifest는 명세 목록(JSON 배열) 또는 한 줄에 하나(JSONL)
+– 작업마다 별도 프로세스, 동시에 --workers개까지. 솔버에는 시간 제한의 80%를 주고,
+  제한 시간이 지나도 끝나지 않으면 프로세스를 종료하고 timeout으로 기록
+– 결과: 작업별 계획 파일(cutting_patterns / cutting_plan 열) + summary.csv + 처리량 출력
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import pandas as pd
+
+from core.jobs import INPUT_KEYS, job_name, run_job
+
+SOFT_RATIO = 0.8   # 솔버 자체 시간 제한 = 작업 제한 × 비율
+GRACE_S = 2.0      # 파일 저장 등 마무리 여유
+
+
+def load_jobs(src, stock_len, chuck_len):
+    """폴더 또는 manifest → 작업 명세 목록 (상대 경로는 명세 파일 위치 기준)"""
+    if os.path.isdir(src):
+        jobs = []
+        for path in sorted(glob.glob(os.path.join(src, "*.json"))):
+            jobs += _read_manifest(path)
+        # 명세가 참조하지 않는 표 파일은 기본 설정의 파이프 절단 리스트로 본다
+        used = {os.path.abspath(os.path.join(j["base"], j[k])) for j in jobs for k in INPUT_KEYS if j.get(k)}
+        for path in sorted(glob.glob(os.path.join(src, "*.csv")) + glob.glob(os.path.join(src, "*.xlsx"))):
+            if os.path.abspath(path) not in used:
+                jobs.append({"type": "pipe", "file": os.path.basename(path), "base": src,
+                             "stock_len": stock_len, "chuck_len": chuck_len})
+        return jobs
+    return _read_manifest(src)
+
+
+def _read_manifest(path):
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        jobs = json.loads(text)
+    elif text.startswith("{") and "\n" not in text:
+        jobs = [json.loads(text)]
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+    base = os.path.dirname(os.path.abspath(path))
+    return [{"base": base, **j} for j in jobs]
+
+
+def _worker(spec, time_limit, out_dir, fmt, conn):
+    conn.send(run_job(spec, time_limit * SOFT_RATIO, out_dir, fmt))
+    conn.close()
+
+
+def run_all(jobs, out_dir, workers, time_limit, fmt):
+    """작업별 프로세스를 workers개까지 동시에 실행 → 요약 dict 목록 (입력 순서)"""
+    results = [None] * len(jobs)
+    pending = list(enumerate(jobs))
+    running = {}   # idx → (process, conn, deadline, t0, spec)
+    while pending or running:
+        while pending and len(running) < workers:
+            i, spec = pending.pop(0)
+            limit = float(spec.get("time_limit", time_limit))
+            recv, send = mp.Pipe(duplex=False)
+            p = mp.Process(target=_worker, args=(spec, limit, out_dir, fmt, send), daemon=True)
+            p.start()
+            send.close()
+            running[i] = (p, recv, time.perf_counter() + limit + GRACE_S, time.perf_counter(), spec)
+
+        for i, (p, conn, deadline, t0, spec) in list(running.items()):
+            if conn.poll():
+                try:
+                    results[i] = conn.recv()
+                except EOFError:
+                    results[i] = _failed(spec, "error", "worker exited", t0)
+            elif not p.is_alive():
+                results[i] = _failed(spec, "error", f"worker exited with code {p.exitcode}", t0)
+            elif time.perf_counter() > deadline:
+                p.terminate()
+                results[i] = _failed(spec, "timeout", f"exceeded {deadline - t0:.0f}s", t0)
+            else:
+                continue
+            p.join()
+            conn.close()
+            del running[i]
+            r = results[i]
+            print(f"[{sum(x is not None for x in results):>4}/{len(jobs)}] {r['status']:<10} "
+                  f"{r['runtime_s']:>7.2f}s  {r['job']}", flush=True)
+        time.sleep(0.02)
+    return results
+
+
+def _failed(spec, status, msg, t0):
+    return {"job": job_name(spec), "type": spec.get("type", "pipe"), "status": status, "error": msg,
+            "runtime_s": round(time.perf_counter() - t0, 3)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("jobs", help="작업 폴더 또는 manifest(.json / .jsonl)")
+    ap.add_argument("-o", "--out", default="batch_out")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--time-limit", type=float, default=60.0, help="작업당 제한 시간(초), 명세의 time_limit 우선")
+    ap.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    ap.add_argument("--stock-len", type=int, default=6000, help="폴더의 절단 리스트 기본 원자재 길이")
+    ap.add_argument("--chuck-len", type=int, default=300)
+    args = ap.parse_args(argv)
+
+    jobs = load_jobs(args.jobs, args.stock_len, args.chuck_len)
+    if not jobs:
+        print(f"no jobs in {args.jobs}")
+        return 1
+    os.makedirs(args.out, exist_ok=True)
+
+    t0 = time.perf_counter()
+    results = run_all(jobs, args.out, max(1, args.workers), args.time_limit, args.format)
+    wall = time.perf_counter() - t0
+
+    summary = pd.DataFrame(results)
+    head = ["job", "type", "status", "runtime_s"]
+    summary = summary[head + [c for c in summary.columns if c not in head]]
+    summary.to_csv(os.path.join(args.out, "summary.csv"), index=False, encoding="utf-8-sig")
+    counts = summary["status"].value_counts().to_dict()
+    busy = summary["runtime_s"].sum()
+    print(f"\n{len(jobs)} jobs in {wall:.1f}s  ({len(jobs) / wall * 60:.1f} jobs/min, "
+          f"{busy / wall:.1f}× parallel)  " + " ".join(f"{k}={v}" for k, v in counts.items()))
+    print(f"summary → {os.path.join(args.out, 'summary.csv')}")
+    return 0 if counts.get("ok", 0) == len(jobs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+벤치마크용 합성 입력 생성기 (seed 고정)
+
+– 파이프 절단 리스트, 코일 주문/Filler/LOT, 견적 BOM, 인보이스 붙여넣기 표, 시트판 부품
+– SIZES: small / medium / production
+"""
+
+import random
+
+import pandas as pd
+
+from core.quote import weights
+
+SIZES = {
+    "small":      {"cut_lines": 10,  "cut_qty": 10, "thk": 1, "widths": 4, "orders": 12,  "fillers": 3, "lots": 6,
+                   "bom": 50,   "invoice": 20,   "sheet_parts": 15},
+    "medium":     {"cut_lines": 60,  "cut_qty": 25, "thk": 2, "widths": 6, "orders": 60,  "fillers": 4, "lots": 30,
+                   "bom": 500,  "invoice": 200,  "sheet_parts": 80},
+    "production": {"cut_lines": 200, "cut_qty": 40, "thk": 3, "widths": 8, "orders": 240, "fillers": 4, "lots": 80,
+                   "bom": 3000, "invoice": 1000, "sheet_parts": 400},
+}
+
+THICKNESSES = [0.6, 0.75, 1.0, 1.2, 1.6]
+COIL_WIDTHS = [1000, 1038, 1219, 1250]
+
+
+def pipe_cut_list(size, seed=0):
+    """→ DataFrame(Length(mm), Qty)"""
+    rng = random.Random(seed)
+    cfg = SIZES[size]
+    lengths = rng.sample(range(150, 3000, 10), cfg["cut_lines"])
+    return pd.DataFrame({
+        "Length(mm)": lengths,
+        "Qty": [rng.randint(1, cfg["cut_qty"]) for _ in lengths],
+    })
+
+
+def sheet_parts(size, seed=0):
+    """→ [(폭, 길이, 수량, 라벨), ...] – 시트판 부품 (부품 수 ≈ 종류 × 평균 수량 5)"""
+    rng = random.Random(seed)
+    return [(rng.randrange(80, 1000, 10), rng.randrange(80, 1800, 10), rng.randint(1, 9), f"P{i + 1}")
+            for i in range(SIZES[size]["sheet_parts"])]
+
+
+def coil_book(size, seed=0):
+    """→ (주문 품명 Series, Filler 품명 Series, LOT DataFrame(LOT_NO, weight, vendor)) – 3번 페이지 입력 형식"""
+    rng = random.Random(seed)
+    cfg = SIZES[size]
+    thks = THICKNESSES[:cfg["thk"]]
+    widths = {t: rng.sample(range(150, 600), cfg["widths"]) for t in thks}
+
+    orders = []
+    for _ in range(cfg["orders"]):
+        t = rng.choice(thks)
+        orders.append(f"{t}Tx{rng.choice(widths[t])}")
+    fillers = [f"{t}Tx{w}" for t in thks for w in rng.sample(range(40, 150), cfg["fillers"])]
+    lots = pd.DataFrame({
+        "LOT_NO": [f"SPCC{int(round(rng.choice(thks) * 100)):03d} {rng.choice(COIL_WIDTHS)} L{i:05d}"
+                   for i in range(cfg["lots"] * cfg["thk"])],
+        "weight": [f"{rng.randint(3000, 12000):,}" for _ in range(cfg["lots"] * cfg["thk"])],
+        "vendor": [rng.choice(["POSCO", "HYUNDAI", "DONGKUK"]) for _ in range(cfg["lots"] * cfg["thk"])],
+    })
+    return pd.Series(orders), pd.Series(fillers), lots
+
+
+def coil_book_jittered(size, seed=0):
+    """coil_book과 같되 주문 폭의 절반 정도에 ±1–2 mm 차이를 준 주문 (폭 허용오차 묶기용)"""
+    orders, fillers, lots = coil_book(size, seed)
+    rng = random.Random(seed + 1)
+    jitter = {}
+    for o in orders.unique():
+        if rng.random() < 0.5:
+            t, w = o.split("Tx")
+            jitter[o] = f"{t}Tx{int(w) + rng.choice([-2, -1, 1, 2])}"
+    return orders.map(lambda o: jitter.get(o, o) if rng.random() < 0.5 else o), fillers, lots
+
+
+def quote_bom(size, seed=0):
+    """→ [(품명, 수량, 단위), ...] – 1번 페이지 에디터 행 형식"""
+    rng = random.Random(seed)
+    specs = ([f"{s} {form}" for form, table in weights.items() for s in table]
+             + [f"Ø{d}×{t} 원형파이프" for d in (21.7, 25.4, 31.8, 42.7) for t in (1.6, 2.3)]
+             + [f"{w}×{h}×{t} 각파이프" for w, h in ((50, 50), (75, 45), (100, 50)) for t in (1.6, 2.3)]
+             + [f"시트판 {t}T×1220×2440 {m}" for t in (1.0, 1.2, 1.6, 2.0, 3.2) for m in ("CR", "HR")])
+    rows = []
+    for i in range(SIZES[size]["bom"]):
+        unit = rng.choice(["ea", "kg"])
+        rows.append((f"{rng.choice(specs)} #{i}", rng.randint(1, 500), unit))
+    return rows
+
+
+def invoice_grid(size, seed=0):
+    """→ 4번 페이지 붙여넣기 표 (Sailing on 행 + 품목 행 + TOTAL 행)"""
+    rng = random.Random(seed)
+    cols = ["Item", "Description", "규격", "Package", "NO of PACK", "Pieces", "Unit Price", "Amount"]
+    parts = ["中层板", "底层板", "END·中", "END·底", "下连杆", "前罩", "安全销"]
+    rows = [["", "Sailing on Mar.5th, 2025", "", "", "", "", "", ""]]
+    total, total_pcs = 0.0, 0
+    for i in range(SIZES[size]["invoice"]):
+        pkg = rng.randint(5, 50)
+        pcs = pkg * rng.choice([6, 8])
+        price = round(rng.uniform(1, 20), 2)
+        total += pcs * price
+        total_pcs += pcs
+        color = rng.choice(["本色", "灰色"])
+        rows.append([str(i + 1), f"SHELF ({rng.choice(parts)}) {color}",
+                     f"{rng.choice([800, 900, 1200])}*{rng.choice([300, 400, 450])}",
+                     str(pkg), "1", str(pcs), f"{price}", f"{pcs * price:.2f}"])
+    # TOTAL 행에도 Pieces 합계가 있는 실제 양식 (수량을 두 번 세지 않는지 확인용)
+    rows.append(["TOTAL", "", "", "", "", str(total_pcs), "", f"{total:.2f}"])
+    return pd.DataFrame(rows, columns=cols)
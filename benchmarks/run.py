@@ -0,0 +1,237 @@
+"""
+최적화 엔진 벤치마크
+
+    python -m benchmarks.run                         # small, medium 실행 후 기준과 비교
+    python -m benchmarks.run --size production
+    python -m benchmarks.run --save                  # 결과를 기준(baseline)으로 저장
+
+– 케이스: 파이프 FFD, 시트판 배치, 슬리팅 패턴 생성(best_fill/gen_preview), 슬리팅 전체(CBC 포함),
+          견적 계산, 인보이스 파싱
+– 지표: 실행시간(반복 중 최소), 최대 메모리(tracemalloc), 사용 막대/원판/코일 수, 폐기량
+– 파이프·슬리팅 계획은 매 실행 core.verify로 검증 (수요 충족·용량·폐기 재계산)
+– 기준 대비 시간·메모리가 허용치 이상 늘거나 품질(막대/원판/코일/폐기)이 나빠지면 회귀로 표시, 종료코드 1
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from benchmarks import generators as gen
+from core.invoice import parse_invoice
+from core.nesting import expand_parts, solve as nest
+from core.parsers import parse_cut_list, parse_lot_list, parse_names
+from core.pipe import expand_pieces, solve
+from core.quote import QuoteBook
+from core.slitting import build_patterns, cluster_orders, match_thk, solve_all
+from core.verify import verify_pipe, verify_slitting
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+STOCK_LEN, CHUCK_LEN = 6000, 300
+ABS_NOISE_S = 0.005   # 이보다 작은 시간 차이는 무시
+
+
+# -------------------------------------------------------------------
+# 1) 케이스 – 준비(setup)는 측정에서 제외, 실행 함수는 품질 지표 dict 반환
+# -------------------------------------------------------------------
+def case_pipe_ffd(size):
+    df = parse_cut_list(gen.pipe_cut_list(size))
+    pieces = expand_pieces(df["Length(mm)"], df["Qty"])
+    eff_len = STOCK_LEN - CHUCK_LEN
+
+    def run():
+        sol = solve(pieces, eff_len)
+        chk = verify_pipe(sol["bars"], pieces, eff_len, CHUCK_LEN)
+        return {"bars": chk["bars"], "waste": chk["waste_mm"], "lower_bound": sol["lower_bound"],
+                "verified": chk["ok"]}
+    return run
+
+
+def case_sheet_nesting(size):
+    parts = expand_parts(gen.sheet_parts(size))
+
+    def run():
+        res = nest(parts)
+        return {"sheets": len(res["sheets"]), "lower_bound": res["lower_bound"]}
+    return run
+
+
+def _coil_inputs(size, book=gen.coil_book):
+    o, f, lots = book(size)
+    orders = parse_names(o)
+    orders["demand"] = 1
+    return orders, parse_names(f), parse_lot_list(lots)
+
+
+def case_slitting_patterns(size):
+    orders, fillers, stock = _coil_inputs(size)
+
+    def run():
+        n = 0
+        for thk, grp in stock.groupby("thk_id"):
+            wids = sorted(match_thk(orders, thk)["width"].unique())
+            pats, _, _ = build_patterns(grp, wids, match_thk(fillers, thk)["width"].tolist())
+            n += sum(len(p) for p in pats.values())
+        return {"patterns": n}
+    return run
+
+
+def case_slitting_solve(size):
+    orders, fillers, stock = _coil_inputs(size)
+
+    def run():
+        rows, _ = solve_all(orders, stock, fillers, time_limit=120)
+        chk = verify_slitting(rows, orders, stock)
+        return {"coils": chk["coils"], "waste": chk["waste_mm"], "verified": chk["ok"]}
+    return run
+
+
+def case_slitting_kg(size):
+    """주문 kg 수요 – 스트립 중량(코일 중량 × 폭 비율) 합으로 충족"""
+    orders, fillers, stock = _coil_inputs(size)
+    orders["demand_kg"] = 300.0
+
+    def run():
+        rows, _ = solve_all(orders, stock, fillers, time_limit=120, by="kg")
+        chk = verify_slitting(rows, orders, stock, by="kg")
+        return {"coils": chk["coils"], "waste": chk["waste_mm"], "order_kg": chk["order_kg"],
+                "verified": chk["ok"]}
+    return run
+
+
+def case_slitting_tolerance(tol):
+    """±1–2 mm 차이 주문 – tol=0(원래 폭) / tol=2(폭 묶기) 비교용"""
+    def case(size):
+        orders, fillers, stock = _coil_inputs(size, gen.coil_book_jittered)
+        clustered, report = cluster_orders(orders, tol)
+
+        def run():
+            rows, _ = solve_all(orders, stock, fillers, time_limit=120, tol=tol)
+            chk = verify_slitting(rows, clustered, stock)
+            return {"widths": report["widths_after"], "coils": chk["coils"], "waste": chk["waste_mm"],
+                    "verified": chk["ok"]}
+        return run
+    return case
+
+
+def case_quote(size):
+    rows = gen.quote_bom(size)
+
+    def run():
+        book = QuoteBook()
+        book.update(rows)
+        return {"groups": len(book.grouped())}
+    return run
+
+
+def case_invoice(size):
+    grid = gen.invoice_grid(size)
+
+    def run():
+        res = parse_invoice(grid.copy())
+        # 총수량 = 품목 행 Pieces 합 (TOTAL 행 수량을 또 더하지 않아야 함)
+        return {"items": len(res["kor_list"]), "qty": res["qty"],
+                "verified": res["qty"] == sum(p for _, p in res["lines"])}
+    return run
+
+
+CASES = {
+    "pipe_ffd": case_pipe_ffd,
+    "sheet_nesting": case_sheet_nesting,
+    "slitting_patterns": case_slitting_patterns,
+    "slitting_solve": case_slitting_solve,
+    "slitting_kg": case_slitting_kg,
+    "slitting_tol0": case_slitting_tolerance(0),
+    "slitting_tol2": case_slitting_tolerance(2),
+    "quote": case_quote,
+    "invoice": case_invoice,
+}
+
+# 값이 커지면 나빠지는 품질 지표
+QUALITY_KEYS = ("bars", "sheets", "coils", "waste")
+
+
+# -------------------------------------------------------------------
+# 2) 측정
+# -------------------------------------------------------------------
+def measure(run, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        metrics = run()
+        times.append(time.perf_counter() - t0)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"runtime_s": round(min(times), 4), "peak_mb": round(peak / 2**20, 2), **metrics}
+
+
+def compare(result, base, tol):
+    """→ 회귀 메시지 목록"""
+    issues = []
+    for case, by_size in result.items():
+        for size, cur in by_size.items():
+            ref = base.get(case, {}).get(size)
+            if not ref:
+                continue
+            tag = f"{case}/{size}"
+            if cur.get("verified") is False:
+                issues.append(f"{tag}: plan failed verification")
+            if cur["runtime_s"] > ref["runtime_s"] * (1 + tol) and cur["runtime_s"] - ref["runtime_s"] > ABS_NOISE_S:
+                issues.append(f"{tag}: runtime {ref['runtime_s']}s → {cur['runtime_s']}s")
+            if cur["peak_mb"] > ref["peak_mb"] * (1 + tol) and cur["peak_mb"] - ref["peak_mb"] > 0.5:
+                issues.append(f"{tag}: peak memory {ref['peak_mb']}MB → {cur['peak_mb']}MB")
+            for k in QUALITY_KEYS:
+                if k in cur and k in ref and cur[k] > ref[k]:
+                    issues.append(f"{tag}: {k} {ref[k]} → {cur[k]}")
+    return issues
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--size", nargs="+", default=["small", "medium"], choices=list(gen.SIZES))
+    ap.add_argument("--case", nargs="+", default=list(CASES), choices=list(CASES))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--tolerance", type=float, default=0.25, help="허용 증가율 (기본 25%%)")
+    ap.add_argument("--save", action="store_true", help="결과를 기준 파일에 저장")
+    args = ap.parse_args(argv)
+
+    result = {}
+    for case in args.case:
+        for size in args.size:
+            res = measure(CASES[case](size), args.repeat)
+            result.setdefault(case, {})[size] = res
+            extra = " ".join(f"{k}={v}" for k, v in res.items() if k not in ("runtime_s", "peak_mb"))
+            print(f"{case:<18} {size:<10} {res['runtime_s']:>9.4f}s {res['peak_mb']:>8.2f}MB  {extra}")
+
+    base = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            base = json.load(f)
+
+    if args.save:
+        for case, by_size in result.items():
+            base.setdefault(case, {}).update(by_size)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(base, f, ensure_ascii=False, indent=2)
+        print(f"baseline saved → {args.baseline}")
+        return 0
+
+    issues = compare(result, base, args.tolerance)
+    for msg in issues:
+        print(f"REGRESSION {msg}")
+    if base and not issues:
+        print("no regressions")
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
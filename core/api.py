@@ -0,0 +1,103 @@
+"""
+JSON 요청 → 최적화 결과 (로컬 HTTP 서비스용)
+
+– 입력/출력 모두 JSON으로 바꿀 수 있는 dict/list
+– run_batch(kind, payloads): 여러 요청을 한 번에 처리 (작업 프로세스 1회 호출로 묶음)
+
+    pipe          {"pieces": [[길이, 수량], ...], "stock_len": 6000, "chuck_len": 300, "time_limit": 2}
+    slitting      {"orders": [{"name": "0.75Tx437", "kg": 1200}, ...],
+                   "lots": [{"LOT_NO": "SPCC075 1250", "weight": 8000, "vendor": "POSCO"}, ...],
+                   "fillers": ["0.75Tx120"], "tol": 0, "by": "count", "time_limit": 10}
+    quote_weight  {"items": [{"name": "시트판 1.0T×1220×2440 CR", "qty": 10, "unit": "ea"}, ...]}
+"""
+
+from collections import Counter
+
+import json
+
+import pandas as pd
+
+from core.parsers import parse_lot_list, parse_names, parse_orders
+from core.pipe import pat_key, solve
+from core.quote import quote_row
+from core.slitting import cluster_orders, plan_table, solve_all
+from core.verify import verify_pipe, verify_slitting
+
+MAX_TIME_S = 30.0
+
+
+def pipe_plan(req):
+    stock_len = int(req.get("stock_len", 6000))
+    chuck_len = int(req.get("chuck_len", 300))
+    eff_len = stock_len - chuck_len
+    pieces = sorted((int(l) for l, q in req["pieces"] for _ in range(int(q))), reverse=True)
+    if not pieces:
+        raise ValueError("no pieces")
+    if pieces[0] > eff_len or pieces[-1] <= 0:
+        raise ValueError(f"piece lengths must be within 1..{eff_len} mm")
+
+    sol = solve(pieces, eff_len, time_limit=min(float(req.get("time_limit", 2.0)), MAX_TIME_S))
+    chk = verify_pipe(sol["bars"], pieces, eff_len, chuck_len)
+    patterns = Counter(pat_key(b) for b in sol["bars"])
+    return {
+        "bars": len(sol["bars"]),
+        "lower_bound": sol["lower_bound"],
+        "optimal": sol["optimal"],
+        "patterns": [{"cuts": list(p), "quantity": q, "remain": eff_len - sum(p)} for p, q in patterns.items()],
+        "waste_mm": chk["waste_mm"],
+        "yield_pct": chk["yield_pct"],
+        "verified": chk["ok"],
+    }
+
+
+def slitting_plan(req):
+    orders = pd.DataFrame(req["orders"])
+    orders = parse_orders(orders[["name"] + (["kg"] if "kg" in orders else [])])
+    stock = parse_lot_list(pd.DataFrame(req["lots"]))
+    fillers = parse_names(pd.Series(req.get("fillers") or [], dtype=str))
+    tol, by = float(req.get("tol", 0)), req.get("by", "count")
+    if orders.empty or stock.empty:
+        raise ValueError("no orders or no lots")
+
+    # 두께 그룹마다 CBC 시간 제한을 나눠 준다 (core.jobs.run_slitting과 같음)
+    time_limit = min(float(req.get("time_limit", 10)), MAX_TIME_S)
+    per_group = max(1.0, time_limit / max(stock["thk_id"].nunique(), 1))
+    rows, statuses = solve_all(orders, stock, fillers, per_group, tol, by)
+    if tol:
+        orders, _ = cluster_orders(orders, tol)
+    chk = verify_slitting(rows, orders, stock, by)
+    return {
+        "plan": json.loads(plan_table(rows).to_json(orient="records", force_ascii=False)),
+        "status": {f"{t / 1000:g}": s for t, s in statuses.items()},
+        "waste_mm": chk["waste_mm"],
+        "yield_pct": chk["yield_pct"],
+        "verified": chk["ok"],
+        "errors": chk["errors"],
+    }
+
+
+def quote_weights(req):
+    out = []
+    for item in req["items"]:
+        res = quote_row(item.get("name", ""), item.get("qty"), item.get("unit", "ea"))
+        if res is None:
+            out.append(None)
+        else:
+            name, text, vendors, missing = res
+            out.append({"name": name, "text": text, "vendors": list(vendors), "missing": missing})
+    return {"items": out}
+
+
+HANDLERS = {"pipe": pipe_plan, "slitting": slitting_plan, "quote_weight": quote_weights}
+
+
+def run_batch(kind, payloads):
+    """같은 종류 요청 묶음 → 결과 목록 (요청별 실패는 {"error": ...})"""
+    handler = HANDLERS[kind]
+    out = []
+    for req in payloads:
+        try:
+            out.append(handler(req))
+        except Exception as e:
+            out.append({"error": f"{type(e).__name__}: {e}"})
+    return out
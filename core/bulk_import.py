@@ -0,0 +1,67 @@
+"""
+XLSX/CSV 대량 업로드
+
+– XLSX: openpyxl read-only 모드로 행 단위 스트리밍
+– CSV : pandas chunksize 읽기
+– 청크마다 벡터화 파서를 적용하고 결과만 이어 붙인다
+"""
+
+import hashlib
+
+import pandas as pd
+from openpyxl import load_workbook
+
+CHUNK_ROWS = 5000
+
+
+def iter_chunks(file, name=None, chunksize=CHUNK_ROWS):
+    """업로드 파일 → 문자열 DataFrame 청크 제너레이터 (첫 행은 헤더)"""
+    name = (name or getattr(file, "name", "")).lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        wb = load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else f"col{i}" for i, h in enumerate(next(rows, ()))]
+            n = len(header)
+            buf = []
+            for r in rows:
+                if all(v is None for v in r):
+                    continue
+                buf.append((tuple(r) + (None,) * n)[:n])
+                if len(buf) >= chunksize:
+                    yield pd.DataFrame(buf, columns=header)
+                    buf = []
+            if buf:
+                yield pd.DataFrame(buf, columns=header)
+        finally:
+            wb.close()
+    else:
+        yield from pd.read_csv(file, chunksize=chunksize, dtype=str, encoding="utf-8-sig",
+                               skip_blank_lines=True)
+
+
+def load_file(file, parser, name=None, chunksize=CHUNK_ROWS):
+    """청크별 parser 적용 → 하나의 타입 지정 DataFrame"""
+    parts = [parser(chunk) for chunk in iter_chunks(file, name, chunksize)]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+def file_key(file):
+    """업로드 파일 식별자 (이름, 내용 sha1) – 이름 · 크기가 같아도 내용이 바뀌면 다른 파일"""
+    return file.name, hashlib.sha1(file.getvalue()).hexdigest()
+
+
+def import_once(state, key, file, parser):
+    """
+    업로드 파일 내용이 바뀐 경우에만 파싱해 state[key] = (file_id, df) 로 보관.
+    file이 None이면 보관 중인 결과를 지운다. → 보관 중인 DataFrame 또는 None
+    """
+    if file is None:
+        state.pop(key, None)
+        return None
+    file_id = file_key(file)
+    cached = state.get(key)
+    if cached is None or cached[0] != file_id:
+        cached = (file_id, load_file(file, parser))
+        state[key] = cached
+    return cached[1]
@@ -0,0 +1,116 @@
+"""
+절단 패턴 차트 (일괄 렌더링)
+
+– 색상별 PolyCollection 1개로 모든 구간을 한 번에 그림
+– 구간 폭에 들어가지 않는 라벨은 생략
+– 패턴 수가 max_rows를 넘으면 수량 상위 패턴만 보여주는 요약 보기
+– 시트판 배치도: 원판별 부품 사각형
+"""
+
+from collections import defaultdict
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+BAR_H = 0.6
+FIG_W = 12
+ROW_H = 0.8
+CHAR_PX = 6        # fontsize 8 기준 글자 폭(px)
+MAX_LABELS = 600   # 라벨 수 상한
+
+
+def _rects(segs, y_half=BAR_H / 2):
+    """[(x, w, y), ...] → (N, 4, 2) 꼭짓점 배열"""
+    a = np.asarray(segs, dtype=float)
+    x, w, y = a[:, 0], a[:, 1], a[:, 2]
+    return np.stack([
+        np.column_stack([x, y - y_half]),
+        np.column_stack([x + w, y - y_half]),
+        np.column_stack([x + w, y + y_half]),
+        np.column_stack([x, y + y_half]),
+    ], axis=1)
+
+
+def pattern_figure(pattern_dict, stock_len, chuck_len, max_rows=30):
+    eff_len = stock_len - chuck_len
+    items = [(i + 1, pat, qty) for i, (pat, qty) in enumerate(pattern_dict.items())]
+    hidden = 0
+    if len(items) > max_rows:
+        items = sorted(items, key=lambda t: t[2], reverse=True)[:max_rows]
+        hidden = len(pattern_dict) - max_rows
+
+    n = len(items)
+    fig, ax = plt.subplots(figsize=(FIG_W, 1 + ROW_H * max(n, 1)))
+    ax.set_xlim(0, stock_len)
+    ax.set_ylim(n + 1.2, -0.2)
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+
+    # 라벨이 들어갈 최소 폭(mm) 추정
+    mm_per_px = stock_len / (FIG_W * fig.dpi * ax.get_position().width)
+
+    segs = defaultdict(list)
+    labels = []
+    for row, (no, pat, qty) in enumerate(items):
+        y = row + 0.4
+        color = colors[(no - 1) % len(colors)]
+        cursor = 0
+        for cut in pat:
+            segs[color].append((cursor, cut, y))
+            labels.append((cursor, cut, y))
+            cursor += cut
+        remain = eff_len - sum(pat)
+        if remain > 0:
+            segs["dimgray"].append((cursor, remain, y))
+            labels.append((cursor, remain, y))
+        segs["lightgray"].append((eff_len, chuck_len, y))
+        ax.text(-200, y, f"Pattern {no} × {qty}", va="center", ha="right", fontsize=10)
+
+    for color, s in segs.items():
+        ax.add_collection(PolyCollection(_rects(s), facecolors=color, edgecolors="white", linewidths=0.5))
+
+    fit = [(x, w, y) for x, w, y in labels if w >= (len(str(w)) * CHAR_PX + 4) * mm_per_px]
+    if len(fit) <= MAX_LABELS:
+        for x, w, y in fit:
+            ax.text(x + w / 2, y, str(w), va="center", ha="center", color="white", fontsize=8)
+
+    ax.set_title("Cutting Pattern Summary (Quantities by Pattern)", fontsize=14)
+    ax.axis("off")
+
+    # ▶ 총 막대 수량 표시
+    total_bars = sum(pattern_dict.values())
+    note = f"TOTAL: {total_bars} bars"
+    if hidden:
+        note += f"  (top {n} patterns shown, {hidden} more in table)"
+    ax.text(stock_len / 2, n + 0.8, note, ha="center", va="center", fontsize=14, fontweight="bold", color="black")
+    return fig
+
+
+def sheet_figure(sheets, sheet_w, sheet_l, max_sheets=6):
+    """시트판 배치도 – 원판별 부품 사각형 (앞에서 max_sheets장)"""
+    shown = sheets[:max_sheets]
+    n = max(len(shown), 1)
+    fig, axes = plt.subplots(1, n, figsize=(2.2 * n, 4.4), squeeze=False)
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    labels = {}
+    for ax, placed in zip(axes[0], shown):
+        segs = defaultdict(list)
+        for p in placed:
+            c = colors[labels.setdefault(p["label"], len(labels)) % len(colors)]
+            x, y, w, l = p["x"], p["y"], p["w"], p["l"]
+            segs[c].append([(x, y), (x + w, y), (x + w, y + l), (x, y + l)])
+        ax.add_collection(PolyCollection([[(0, 0), (sheet_w, 0), (sheet_w, sheet_l), (0, sheet_l)]],
+                                         facecolors="lightgray", edgecolors="dimgray"))
+        for c, s in segs.items():
+            ax.add_collection(PolyCollection(s, facecolors=c, edgecolors="white", linewidths=0.5))
+        used = sum(p["w"] * p["l"] for p in placed) / (sheet_w * sheet_l) * 100
+        ax.set_title(f"{len(placed)} pcs · {used:.0f}%", fontsize=9)
+        ax.set_xlim(0, sheet_w)
+        ax.set_ylim(sheet_l, 0)
+        ax.set_aspect("equal")
+        ax.axis("off")
+    for ax in axes[0][len(shown):]:
+        ax.axis("off")
+    if len(sheets) > max_sheets:
+        fig.suptitle(f"first {max_sheets} of {len(sheets)} sheets", fontsize=10)
+    return fig
@@ -0,0 +1,119 @@
+"""
+코일 LOT 재고 – SQLite 저장소
+
+– 파싱된 열(material, thk_id, width, production_date ...)을 그대로 저장
+– (material, thk_id, width, production_date) 인덱스로 후보 코일 조회
+– 입고 리스트 일괄 upsert
+"""
+
+import sqlite3
+
+import pandas as pd
+
+DB_FILE = "coil_inventory.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS coils (
+    lot_no          TEXT    PRIMARY KEY,
+    material        TEXT,
+    thk_id          INTEGER NOT NULL,
+    width           INTEGER NOT NULL,
+    production_date TEXT,
+    sequence        INTEGER,
+    weight          REAL,
+    vendor          TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_coils_mat_thk_width_date ON coils(material, thk_id, width, production_date);
+CREATE INDEX IF NOT EXISTS idx_coils_thk_width ON coils(thk_id, width);
+"""
+
+COLUMNS = ["lot_no", "material", "thk_id", "width", "production_date", "sequence", "weight", "vendor"]
+
+
+def rows_from_coil_lots(parsed: pd.DataFrame) -> pd.DataFrame:
+    """parse_coil_lots 결과 → 저장 형식 (형식 오류 LOT 제외)"""
+    df = parsed.dropna(subset=["thickness_mm", "width_mm"])
+    return pd.DataFrame({
+        "lot_no": df["coil_lot_no"],
+        "material": df["material"],
+        "thk_id": (df["thickness_mm"] * 1000).round().astype(int),
+        "width": df["width_mm"].astype(int),
+        "production_date": df["production_date"].astype(str),
+        "sequence": df["sequence"].astype("Int64"),
+        "weight": None,
+        "vendor": None,
+    })
+
+
+def rows_from_stock(stock: pd.DataFrame) -> pd.DataFrame:
+    """parse_lot_list 결과 → 저장 형식"""
+    return pd.DataFrame({
+        "lot_no": stock["coil_id"],
+        "material": stock["coil_id"].str.extract(r"^([A-Z]+)")[0],
+        "thk_id": stock["thk_id"],
+        "width": stock["width"],
+        "production_date": None,
+        "sequence": None,
+        "weight": stock["weight"],
+        "vendor": stock["vendor"],
+    })
+
+
+class CoilInventory:
+    def __init__(self, path=DB_FILE):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def upsert(self, rows: pd.DataFrame):
+        """lot_no 기준 일괄 upsert"""
+        rows = rows[COLUMNS].astype(object).where(rows[COLUMNS].notna(), None)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO coils ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                "ON CONFLICT(lot_no) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in COLUMNS[1:]),
+                rows.itertuples(index=False, name=None),
+            )
+        return len(rows)
+
+    def delete(self, lot_nos):
+        with self.conn:
+            self.conn.executemany("DELETE FROM coils WHERE lot_no = ?", [(l,) for l in lot_nos])
+
+    def lot_nos(self):
+        return [r[0] for r in self.conn.execute("SELECT lot_no FROM coils ORDER BY production_date, lot_no")]
+
+    def thk_ids(self, material=None):
+        sql, args = "SELECT DISTINCT thk_id FROM coils", []
+        if material:
+            sql, args = sql + " WHERE material = ?", [material]
+        return [r[0] for r in self.conn.execute(sql + " ORDER BY thk_id", args)]
+
+    def candidates(self, thk_ids, min_width=0, max_width=None, material=None):
+        """
+        두께(thk_id 목록)·폭 범위·재질로 후보 코일 조회 (인덱스 사용, 오래된 생산일 우선)
+        → 슬리팅 최적화 재고 형식: coil_id, vendor, thickness, width, weight, qty, thk_id
+        """
+        thk_ids = list(thk_ids)
+        sql = (f"SELECT lot_no, vendor, thk_id, width, weight FROM coils "
+               f"WHERE thk_id IN ({', '.join('?' * len(thk_ids))}) AND width >= ?")
+        args = [*thk_ids, min_width]
+        if max_width is not None:
+            sql += " AND width <= ?"
+            args.append(max_width)
+        if material:
+            sql += " AND material = ?"
+            args.append(material)
+        df = pd.read_sql_query(sql + " ORDER BY production_date, lot_no", self.conn, params=args)
+        return pd.DataFrame({
+            "coil_id": df["lot_no"],
+            "vendor": df["vendor"],
+            "thickness": df["thk_id"] / 1000,
+            "width": df["width"],
+            "weight": df["weight"],
+            "qty": 1,
+            "thk_id": df["thk_id"],
+        })
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM coils").fetchone()[0]
@@ -0,0 +1,70 @@
+"""
+Data Editor 행 단위 변경 추적
+
+– 에디터 변경 집합(edited_rows / added_rows / deleted_rows) → 바뀐 행 위치
+– RowParser: 키(품명 등) → 파싱 결과 캐시, 바뀐 행만 다시 파싱
+"""
+
+import pandas as pd
+
+
+def changed_positions(editor_state, n_base):
+    """
+    에디터 상태 → 출력 프레임 기준 변경 행 위치 집합.
+    삭제가 있으면 위치가 밀리므로 None (호출 측에서 전체 비교).
+    """
+    if not editor_state:
+        return set()
+    if editor_state.get("deleted_rows"):
+        return None
+    pos = {int(i) for i in editor_state.get("edited_rows", {})}
+    pos |= {n_base + i for i in range(len(editor_state.get("added_rows", [])))}
+    return pos
+
+
+class RowParser:
+    """행 키 → 파싱 결과(dict) 캐시. update()는 바뀐 행만 다시 조회한다."""
+
+    def __init__(self, parse, columns):
+        self.parse = parse
+        self.columns = list(columns)
+        self.cache = {}
+        self.keys = []
+        self.rows = []
+        self._frame = pd.DataFrame(columns=self.columns)
+
+    def _lookup(self, key):
+        rec = self.cache.get(key)
+        if rec is None:
+            try:
+                d = self.parse(key)
+                rec = tuple(d.get(c) for c in self.columns)
+            except Exception:
+                rec = (None,) * len(self.columns)
+            self.cache[key] = rec
+        return rec
+
+    def update(self, keys, changed=None):
+        """
+        keys: 현재 행 키 목록, changed: 바뀐 행 위치 (None이면 이전 키와 비교)
+        → 파싱 결과 DataFrame (행 순서 = keys)
+        """
+        keys = ["" if pd.isna(k) else str(k) for k in keys]
+        n = len(keys)
+        if changed is None:
+            old = self.keys
+            changed = [i for i in range(n) if i >= len(old) or old[i] != keys[i]]
+        changed = [i for i in changed if i < n]
+
+        if not changed and n == len(self.rows):
+            return self._frame
+        rows = self.rows[:n] + [None] * (n - len(self.rows))
+        for i in changed:
+            rows[i] = self._lookup(keys[i])
+        # 이전 실행과 무관하게 비어 있는 자리는 채운다
+        for i in range(len(self.rows), n):
+            if rows[i] is None:
+                rows[i] = self._lookup(keys[i])
+        self.keys, self.rows = keys, rows
+        self._frame = pd.DataFrame(rows, columns=self.columns)
+        return self._frame
@@ -0,0 +1,219 @@
+"""
+인보이스 파싱 (중국 수입 인보이스 → 한국품명)
+
+– 열 추론(infer_cols), 규격 추출, 한국품명 생성(make_kor)
+– parse_invoice: 품명 리스트 · 총수량 · USD 합계 · 선적일(Sailing on)
+– 월말 일괄 처리: XLSX 여러 개 병렬 파싱(parse_many) → 선적일별 집계(aggregate) → 통합 보고서(report_xlsx)
+"""
+
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+SIZE_RE = re.compile(r"(\d{2,4})\s*[＊*×xX]\s*(\d{2,4})")
+DATE_RE = re.compile(r"([A-Z][a-z]{2})\.?(\d{1,2})th,?\s*(\d{4})")
+
+
+def safe_int(v):
+    try:
+        return int(float(str(v).replace(",", "").strip()))
+    except Exception:
+        return None
+
+
+def eval_int(v):
+    try:
+        return int(eval(str(v).replace("=", "").strip()))
+    except Exception:
+        return safe_int(v)
+
+
+def extract_size(s):
+    m = SIZE_RE.search(s)
+    return f"{m.group(1)}x{m.group(2)}" if m else ""
+
+
+def make_kor(cn, size, ratio):
+    base = "FM슬림곤도라" if ratio == 8 else "FM곤도라"
+    color = "무도장" if "本色" in cn else ("다크그레이" if ratio == 8 else "딥그레이")
+    sub = re.search(r"[（(](.+?)[）)]", cn)
+    sub = sub.group(1) if sub else ""
+    mids = {
+        "中层板": "중선반", "底层板": "밑선반", "END·中": "END라운드중선반",
+        "END·底": "END라운드밑선반", "下连杆": "하연결대", "前罩": "앞장", "安全销": "안전핀",
+    }
+    mid = next((mids[k] for k in mids if k in sub), "기타")
+    return f"{base} {mid}{(' ' + size) if size else ''} {color}".replace("*", "x").strip()
+
+
+def infer_cols(df: pd.DataFrame) -> pd.DataFrame:
+    cmap = {}
+    for c in df.columns:
+        s = df[c].astype(str).head(10)
+        if any(SIZE_RE.search(v) for v in s):
+            cmap[c] = "규격"
+        elif any("SHELF" in v.upper() for v in s):
+            cmap[c] = "품명"
+        elif s.str.fullmatch(r"\d{1,6}").all():
+            if "Package" not in cmap.values():
+                cmap[c] = "Package"
+            elif "Pieces" not in cmap.values():
+                cmap[c] = "Pieces"
+    df.rename(columns=cmap, inplace=True)
+    if "규격" not in df.columns:
+        df["규격"] = df.apply(
+            lambda r: next((extract_size(str(v)) for v in r.values if isinstance(v, str) and SIZE_RE.search(v)), ""),
+            axis=1,
+        )
+    return df
+
+
+def parse_invoice(df: pd.DataFrame) -> dict:
+    """
+    붙여넣은 인보이스 표 → 한국품명 리스트, 총수량, USD 합계, 선적일
+    수량 계산 실패 시 qty_error에 사유를 담는다.
+    """
+    strip = df.map if hasattr(df, "map") else df.applymap
+    df = infer_cols(strip(lambda x: x.strip() if isinstance(x, str) else x))
+    kor_list, lines, qty, usd, ship_date, qty_error = [], [], 0, 0.0, None, None
+    total_rows = []   # TOTAL/소계/합계 행 – 수량 합산에서 제외 (품목 행 합계를 또 더하지 않도록)
+
+    for i, row in df.iterrows():
+        row_join = " ".join(str(v) for v in row.values if isinstance(v, str))
+        if "Sailing on" in row_join:
+            m = DATE_RE.search(row_join)
+            if m:
+                mon, day, yr = m.groups()
+                ship_date = datetime.strptime(f"{yr}-{mon}-{day}", "%Y-%b-%d").date()
+            continue
+
+        if str(row.get("Item", "")).upper().startswith(("TOTAL", "소계", "합계")):
+            total_rows.append(i)
+            try:
+                usd = float(str(row.dropna().iloc[-1]).replace(",", ""))
+            except Exception:
+                pass
+            continue
+
+        desc = str(row.get("품명", "")).strip()
+        if not desc:
+            continue
+
+        size = str(row.get("규격", "")).strip()
+        if size.startswith("="):
+            try:
+                size = str(eval(size.lstrip("=")))
+            except Exception:
+                size = ""
+        if not SIZE_RE.search(size):
+            size = extract_size(desc)
+
+        pkg = eval_int(row.get("Package", ""))
+        pcs = safe_int(row.get("Pieces", ""))
+
+        ratio = round(pcs / pkg) if pkg and pcs else 8
+        kor_list.append(make_kor(desc, size, ratio))
+        if pcs is not None:
+            lines.append((kor_list[-1], pcs))
+
+    # ✅ Pieces 열의 모든 숫자 추출 후 합산 (TOTAL 행 제외)
+    try:
+        qty = (
+            df["Pieces"]
+            .drop(index=total_rows)
+            .dropna()
+            .astype(str)
+            .apply(lambda x: sum(map(float, re.findall(r"\d+(?:\.\d+)?", x))))
+            .sum()
+        )
+        qty = int(qty) if qty == int(qty) else round(qty, 2)
+    except Exception as e:
+        qty_error = str(e)
+        qty = 0
+
+    return {"kor_list": kor_list, "lines": lines, "qty": qty, "usd": usd, "ship_date": ship_date,
+            "qty_error": qty_error}
+
+
+# -------------------------------------------------------------------
+# 월말 일괄 처리
+# -------------------------------------------------------------------
+HEADER_KEYS = {"ITEM", "DESCRIPTION"}
+
+
+def read_invoice_file(src) -> pd.DataFrame:
+    """
+    인보이스 XLSX(경로 또는 bytes) → parse_invoice 입력 표
+    Item/Description 머리글 행을 찾아 열 이름으로 쓰고, 그 위 행(Sailing on 등)은 그대로 둔다.
+    셀은 붙여넣기 표와 같게 문자열로 바꾼다.
+    """
+    df = pd.read_excel(io.BytesIO(src) if isinstance(src, bytes) else src, header=None, dtype=object)
+    df = (df.map if hasattr(df, "map") else df.applymap)(lambda v: v if pd.isna(v) else str(v))
+    df = df.dropna(how="all")
+    for i, row in df.iterrows():
+        if HEADER_KEYS & {str(v).strip().upper() for v in row.values}:
+            df.columns = [str(v).strip() if pd.notna(v) and str(v).strip() else f"col{j}"
+                          for j, v in enumerate(row.values)]
+            df = df.drop(index=i)
+            break
+    return df.fillna("").reset_index(drop=True)
+
+
+def _parse_file(item):
+    name, src = item
+    try:
+        res = parse_invoice(read_invoice_file(src))
+        return {"file": name, **res, "error": res["qty_error"]}
+    except Exception as e:
+        return {"file": name, "kor_list": [], "lines": [], "qty": 0, "usd": 0.0, "ship_date": None,
+                "error": f"{type(e).__name__}: {e}"}
+
+
+def parse_many(files, workers=None):
+    """
+    [(파일 이름, 경로 또는 bytes), ...] → 파일별 parse_invoice 결과 (+ file, error), 입력 순서
+    파일이 몇 개 안 되면 프로세스 시작 비용이 더 커서 그냥 순서대로 처리한다.
+    """
+    files = list(files)
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    if workers < 2 or len(files) < 4:
+        return [_parse_file(f) for f in files]
+    with ProcessPoolExecutor(workers) as ex:
+        return list(ex.map(_parse_file, files))
+
+
+def aggregate(results):
+    """
+    파일별 결과 → (선적일별 요약, 선적일 × 한국품명 집계, 파일 목록) DataFrame
+    선적일(Sailing on)을 못 찾은 파일은 "미상"으로 묶는다.
+    """
+    def day(r):
+        return r["ship_date"].isoformat() if r["ship_date"] else "미상"
+
+    files = pd.DataFrame([{"파일": r["file"], "Sailing on": day(r), "수량": r["qty"], "USD": r["usd"],
+                           "품목 수": len(set(r["kor_list"])), "오류": r["error"] or ""} for r in results])
+    lines = pd.DataFrame([(day(r), kor, pcs) for r in results for kor, pcs in r["lines"]],
+                         columns=["Sailing on", "한국품명", "Pieces"])
+    items = (lines.groupby(["Sailing on", "한국품명"], as_index=False)
+             .agg(행수=("Pieces", "size"), Pieces=("Pieces", "sum")))
+    summary = (files.groupby("Sailing on", as_index=False)
+               .agg(파일수=("파일", "size"), 수량=("수량", "sum"), USD=("USD", "sum"))
+               .merge(items.groupby("Sailing on").size().rename("품목 수").reset_index(), how="left")
+               .fillna({"품목 수": 0})
+               .astype({"품목 수": int}))
+    summary["USD"] = summary["USD"].round(2)
+    return summary, items, files
+
+
+def report_xlsx(summary, items, files) -> bytes:
+    """통합 보고서 (요약 · 품목 · 파일 시트)"""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as xw:
+        summary.to_excel(xw, sheet_name="요약", index=False)
+        items.to_excel(xw, sheet_name="품목", index=False)
+        files.to_excel(xw, sheet_name="파일", index=False)
+    return buf.getvalue()
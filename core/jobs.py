@@ -0,0 +1,109 @@
+"""
+화면 없이 실행하는 절단 · 슬리팅 작업
+
+– 작업 명세(dict) → 입력 파일 읽기 → 최적화 → 검증 → 계획 표(DataFrame) + 지표
+– 배치 CLI(batch.run)와 다른 자동화 진입점에서 공통으로 사용
+
+    {"type": "pipe", "file": "cut_list.xlsx", "stock_len": 6000, "chuck_len": 300}
+    {"type": "slitting", "orders": "orders.csv", "lots": "lots.xlsx", "fillers": "fillers.csv",
+     "tol": 0, "by": "count"}
+"""
+
+import os
+import time
+from collections import Counter
+
+import pandas as pd
+
+from core.bulk_import import load_file
+from core.parsers import parse_cut_list, parse_lot_list, parse_names, parse_orders
+from core.pipe import expand_pieces, pat_key, pattern_table, reduce_patterns, solve
+from core.slitting import cluster_orders, plan_table, solve_all
+from core.verify import verify_pipe, verify_slitting
+
+DEFAULTS = {
+    "pipe": {"stock_len": 6000, "chuck_len": 300, "reduce_setups": False, "max_extra": 0},
+    "slitting": {"fillers": None, "tol": 0, "by": "count"},
+}
+
+
+def _read(path, parser, base):
+    path = os.path.join(base, path)
+    return load_file(path, parser, name=path)
+
+
+def run_pipe(spec, time_limit, base="."):
+    """→ (cutting_patterns 표, 지표)"""
+    df = _read(spec["file"], parse_cut_list, base)
+    pieces = expand_pieces(df["Length(mm)"], df["Qty"])
+    eff_len = spec["stock_len"] - spec["chuck_len"]
+    if not pieces:
+        raise ValueError("empty cut list")
+    if eff_len <= 0 or pieces[0] > eff_len:
+        raise ValueError(f"piece {pieces[0]} mm does not fit stock {spec['stock_len']} mm")
+
+    sol = solve(pieces, eff_len, time_limit=time_limit)
+    bars = sol["bars"]
+    if spec["reduce_setups"]:
+        bars = reduce_patterns(bars, eff_len, spec["max_extra"])
+    chk = verify_pipe(bars, pieces, eff_len, spec["chuck_len"])
+    table = pattern_table(Counter(pat_key(b) for b in bars), eff_len, spec["chuck_len"])
+    return table, {"pieces": len(pieces), "bars": len(bars), "lower_bound": sol["lower_bound"],
+                   "waste_mm": chk["waste_mm"], "yield_pct": chk["yield_pct"], "verified": chk["ok"]}
+
+
+def run_slitting(spec, time_limit, base="."):
+    """→ (cutting_plan 표, 지표)"""
+    orders = _read(spec["orders"], parse_orders, base)
+    stock = _read(spec["lots"], parse_lot_list, base)
+    fillers = (_read(spec["fillers"], lambda c: parse_names(c.iloc[:, 0]), base)
+               if spec["fillers"] else pd.DataFrame())
+    if orders.empty or stock.empty:
+        raise ValueError("no orders or no stock")
+
+    # 두께 그룹마다 CBC 시간 제한을 나눠 준다
+    per_group = max(1.0, time_limit / max(stock["thk_id"].nunique(), 1))
+    rows, statuses = solve_all(orders, stock, fillers, per_group, spec["tol"], spec["by"])
+    if spec["tol"]:
+        orders, _ = cluster_orders(orders, spec["tol"])
+    chk = verify_slitting(rows, orders, stock, spec["by"])
+    failed = sorted(t for t, s in statuses.items() if s != "ok")
+    return plan_table(rows), {"orders": len(orders), "coils": len(rows), "waste_mm": chk["waste_mm"],
+                              "yield_pct": chk["yield_pct"], "verified": chk["ok"],
+                              "failed_thk": ",".join(str(t / 1000) for t in failed)}
+
+
+RUNNERS = {"pipe": run_pipe, "slitting": run_slitting}
+INPUT_KEYS = ("file", "orders", "lots", "fillers")
+
+
+def job_name(spec):
+    """명세의 name, 없으면 입력 파일 이름"""
+    return spec.get("name") or os.path.splitext(os.path.basename(spec.get("file") or spec.get("orders") or "job"))[0]
+
+
+def run_job(spec, time_limit, out_dir, fmt="csv"):
+    """
+    작업 1건 실행 → 계획 파일 저장 → 요약 dict
+    실패해도 예외를 올리지 않고 status="error"로 돌려준다.
+    """
+    kind = spec.get("type", "pipe")
+    spec = {**DEFAULTS.get(kind, {}), **spec}
+    name = job_name(spec)
+    out = {"job": name, "type": kind, "status": "ok"}
+    t0 = time.perf_counter()
+    try:
+        table, metrics = RUNNERS[kind](spec, time_limit, spec.get("base", "."))
+        stem = "cutting_patterns" if kind == "pipe" else "cutting_plan"
+        path = os.path.join(out_dir, f"{name}_{stem}.{fmt}")
+        if fmt == "xlsx":
+            table.to_excel(path, index=False)
+        else:
+            table.to_csv(path, index=False, encoding="utf-8-sig")
+        out.update(metrics, plan=path)
+        if not metrics["verified"]:
+            out["status"] = "unverified"
+    except Exception as e:
+        out.update(status="error", error=f"{type(e).__name__}: {e}")
+    out["runtime_s"] = round(time.perf_counter() - t0, 3)
+    return out
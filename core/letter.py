@@ -0,0 +1,137 @@
+"""
+협조전(대금 지급 요청) 문서 생성
+
+– 본문은 모듈 로드 시 한 번 만든 string.Template에 값만 채움
+– 강조(지급·은행 정보)는 모든 대상을 하나의 정규식(긴 것 우선 alternation)으로 묶어 한 번만 훑음
+– 같은 입력이면 캐시된 결과 재사용 (rerun마다 다시 만들지 않음)
+– letters_zip: 수입 차수 여러 건을 HTML/텍스트 파일로 한꺼번에
+"""
+
+import html
+import io
+import re
+import zipfile
+from datetime import date
+from functools import lru_cache
+from string import Template
+
+KRW, CNY = 1400.39, 7.2405
+DEFAULT_ITEM = "FM곤도라 중선반 800×300 다크그레이"
+BANK_KEYS = ("beneficiary", "account_number", "bank", "swift")
+
+TEMPLATE = Template("""중국 2025-${cheosu}차 수입 물품(${load_md} 상차, ${in_md} 입고 예정분) 대금 지급을 요청합니다.
+
+* 지급 업체 :
+    ${beneficiary}
+
+* 은행정보 :
+    ACCOUNT NUMBER : ${account_number}
+    BENEFICIARY BANK : ${bank}
+    SWIFT CODE : ${swift}
+
+* BANK ADDRESS :
+    ${bank_address}
+
+* 지급 요청 금액 :
+    $$${usd}
+
+* 운송컨테이너 :
+    ${container}
+
+* 수입품 내역 :
+    ${main_item} 외 ${others}품목   ${qty} EA
+
+* 수입품 금액 :
+    $$${usd} = ₩${krw_amount} = ￥${cny_amount}
+
+※ 환율(${today}) : ₩${krw}/$$, ￥${cny}/$$
+
+※ 지급 사유 :
+    24차 12/3 입고분 대금 지급 보류(담보성)
+    ${cheosu}차 ${in_md} 입고 예정
+    제조업체 자금 부족
+""")
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body {{ font-family:굴림; font-size:9pt; white-space:pre-wrap }}</style>
+</head><body>{body}</body></html>
+"""
+
+
+def summarize_items(kor_list):
+    """한국품명 리스트 → (대표 품목, 나머지 품목 수)"""
+    return (kor_list[0] if kor_list else DEFAULT_ITEM), max(len(set(kor_list)) - 1, 0)
+
+
+@lru_cache(maxsize=64)
+def highlight_re(terms):
+    """
+    강조 대상 → 하나의 정규식 (대소문자 무시, 공백 길이 무시)
+    긴 대상부터 시도해 짧은 대상이 긴 대상 일부를 먼저 잡지 않도록 한다.
+    """
+    parts = [r"\s+".join(map(re.escape, t.split())) for t in sorted(set(terms), key=len, reverse=True) if t.strip()]
+    return re.compile("|".join(parts), flags=re.IGNORECASE) if parts else None
+
+
+def to_html(text, terms=()):
+    """본문 → HTML (줄 앞 공백은 &nbsp;, 강조 대상은 빨간 굵은 글씨, 나머지는 escape)"""
+    rx = highlight_re(tuple(terms))
+    out = []
+    for line in text.split("\n"):
+        body = line.lstrip()
+        pos, buf = 0, ["&nbsp;" * (len(line) - len(body))]
+        for m in rx.finditer(body) if rx else ():
+            buf += [html.escape(body[pos:m.start()]), f'<b><font color="red">{html.escape(m.group())}</font></b>']
+            pos = m.end()
+        buf.append(html.escape(body[pos:]))
+        out.append("".join(buf))
+    return "<br>".join(out)
+
+
+@lru_cache(maxsize=256)
+def render(cheosu, load_dt, in_dt, main_item, others, qty, usd, bank_info, container,
+           krw, cny, today):
+    """
+    → (본문 텍스트, 강조 HTML). bank_info는 (beneficiary, account_number, bank, swift, bank_address)
+    입력이 모두 hashable이라 같은 값이면 캐시에서 돌려준다.
+    """
+    beneficiary, account_number, bank, swift, bank_address = bank_info
+    text = TEMPLATE.substitute(
+        cheosu=cheosu,
+        load_md=f"{load_dt.month}/{load_dt.day}",
+        in_md=f"{in_dt.month}/{in_dt.day}",
+        beneficiary=beneficiary, account_number=account_number, bank=bank, swift=swift,
+        bank_address=bank_address, container=container,
+        main_item=main_item, others=others, qty=qty,
+        usd=f"{usd:,.2f}", krw_amount=f"{int(usd * krw):,}", cny_amount=f"{int(usd * cny):,}",
+        krw=krw, cny=cny, today=today,
+    )
+    terms = (beneficiary, account_number, bank, swift) + tuple(bank_address.splitlines())
+    return text, to_html(text, terms)
+
+
+def letter(cfg, cheosu, load_dt, in_dt, kor_list, qty, usd, krw=KRW, cny=CNY, today=None):
+    """페이지 설정(cfg) + 인보이스 결과 → (텍스트, HTML)"""
+    main_item, others = summarize_items(kor_list)
+    bank_info = tuple(cfg[k] for k in BANK_KEYS) + (cfg["bank_address"],)
+    return render(str(cheosu), load_dt, in_dt, main_item, others, qty, float(usd), bank_info,
+                  cfg["container"], krw, cny, today or date.today())
+
+
+def letters_zip(batches, cfg, fmt=("html", "txt"), krw=KRW, cny=CNY, today=None):
+    """
+    batches: [{"cheosu", "load_dt", "in_dt", "kor_list", "qty", "usd"}, ...]
+    → 차수별 협조전_<차수>.html / .txt 를 담은 zip bytes
+    """
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for b in batches:
+            text, body = letter(cfg, b["cheosu"], b["load_dt"], b["in_dt"], b["kor_list"], b["qty"], b["usd"],
+                                krw, cny, today)
+            name = f"협조전_{b['cheosu']}"
+            if "txt" in fmt:
+                zf.writestr(f"{name}.txt", text)
+            if "html" in fmt:
+                zf.writestr(f"{name}.html", PAGE.format(title=html.escape(name), body=body))
+    return buf.getvalue()
@@ -0,0 +1,59 @@
+"""
+희소 행렬(CSR) → pulp 모델 일괄 생성
+
+– 제약 행렬을 (indptr, indices, data) CSR 배열로 받아 행마다 LpAffineExpression을 dict 생성으로 만든다
+– 변수 이름은 x0..xn, 제약 이름은 c0..cm (이름 정리·중복 검사 비용 없음)
+– 생성 시간은 비영(nonzero) 원소 수에 선형
+"""
+
+import numpy as np
+import pulp
+
+SENSE = {"<=": pulp.LpConstraintLE, ">=": pulp.LpConstraintGE, "==": pulp.LpConstraintEQ}
+
+
+def csr(rows, cols, vals, n_rows):
+    """COO(rows, cols, vals) → CSR (indptr, indices, data). 0 값은 버린다"""
+    rows, cols, vals = np.asarray(rows), np.asarray(cols), np.asarray(vals, dtype=float)
+    nz = vals != 0
+    rows, cols, vals = rows[nz], cols[nz], vals[nz]
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols[order], vals[order]
+
+
+def vstack(*blocks):
+    """CSR 블록을 세로로 이어 붙임"""
+    indptr = [np.zeros(1, dtype=np.int64)]
+    offset = 0
+    for p, _, _ in blocks:
+        indptr.append(p[1:] + offset)
+        offset += p[-1]
+    return (np.concatenate(indptr),
+            np.concatenate([b[1] for b in blocks]),
+            np.concatenate([b[2] for b in blocks]))
+
+
+def build(name, cost, matrix, senses, rhs, cat="Binary"):
+    """
+    min cost·x  s.t.  matrix · x (senses) rhs
+    matrix: CSR (indptr, indices, data), senses: 행별 "<=" / ">=" / "=="
+    → (LpProblem, 변수 리스트)
+    """
+    indptr, indices, data = matrix
+    model = pulp.LpProblem(name, pulp.LpMinimize)
+    # PuLP 3.x의 add_variable은 변수마다 나오는 DeprecationWarning 경로를 건너뜀 (구버전은 LpVariable)
+    new_var = getattr(model, "add_variable", None) or pulp.LpVariable
+    x = [new_var(f"x{i}", cat=cat) for i in range(len(cost))]
+    model.setObjective(pulp.LpAffineExpression(zip(x, np.asarray(cost, dtype=float).tolist())))
+
+    xs = np.empty(len(x), dtype=object)
+    xs[:] = x
+    cols, vals = xs[indices].tolist(), data.tolist()
+    bounds = indptr.tolist()
+    model.extend({
+        f"c{r}": pulp.LpConstraint(pulp.LpAffineExpression(zip(cols[a:b], vals[a:b])), SENSE[s], rhs=float(v))
+        for r, (a, b, s, v) in enumerate(zip(bounds[:-1], bounds[1:], senses, rhs))
+    })
+    return model, x
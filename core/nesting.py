@@ -0,0 +1,215 @@
+"""
+시트판 2D 절단 계획 (Guillotine Nesting)
+
+– 표준 원판(기본 1220×2440)에서 직사각 부품을 잘라낼 원판 수 최소화
+– 빠른 모드: 면적 내림차순 + Best-Area-Fit, 자유 사각형은 면적 정렬 인덱스(bisect)로 조회
+– 개선 모드: 정렬 기준 × 분할 규칙 조합, 이후 순서 교란 재시작 (하한 도달 또는 시간 초과 시 중단)
+– 모든 절단은 원판 끝까지 가는 직선(guillotine) → 전단기/패널쏘에서 그대로 작업 가능
+"""
+
+import math
+import random
+import time
+from bisect import bisect_left, insort
+
+from core import timing
+
+SHEET_W, SHEET_L = 1220, 2440
+
+ORDERS = {
+    "area": lambda p: (p[0] * p[1], max(p[0], p[1])),
+    "long_side": lambda p: (max(p[0], p[1]), min(p[0], p[1])),
+    "perimeter": lambda p: (p[0] + p[1], max(p[0], p[1])),
+    "width": lambda p: (p[0], p[1]),
+    "length": lambda p: (p[1], p[0]),
+}
+SPLITS = ("short_axis", "long_axis")
+
+
+def expand_parts(parts):
+    """[(폭, 길이, 수량, 라벨), ...] → 부품 리스트 [(폭, 길이, 라벨), ...]"""
+    return [(int(round(w)), int(round(l)), label) for w, l, q, label in parts for _ in range(int(q))]
+
+
+def _is_big(w, l, W, L, rotate):
+    """가능한 모든 방향에서 폭·길이 모두 원판 절반 초과 → 이런 부품끼리는 한 원판에 놓일 수 없음"""
+    fits = [(a, b) for a, b in ([(w, l), (l, w)] if rotate else [(w, l)]) if a <= W and b <= L]
+    return bool(fits) and all(a > W / 2 and b > L / 2 for a, b in fits)
+
+
+def lower_bound(parts, sheet=(SHEET_W, SHEET_L), rotate=True):
+    """면적 하한 ceil(Σ부품 면적 / 원판 면적)과 '큰 부품' 수 중 큰 값"""
+    if not parts:
+        return 0
+    W, L = sheet
+    area = sum(w * l for w, l, _ in parts)
+    big = sum(1 for w, l, _ in parts if _is_big(w, l, W, L, rotate))
+    return max(-(-area // (W * L)), big)
+
+
+# -------------------------------------------------------------------
+# 1) 자유 사각형 인덱스
+# -------------------------------------------------------------------
+class FreeRects:
+    """
+    자유 사각형을 (면적, 번호) 정렬 리스트로 보관.
+    면적 ≥ 부품 면적 위치부터 훑으므로 처음 들어맞는 사각형이 곧 Best-Area-Fit.
+    최소 부품 변보다 좁은 사각형은 조회 중 제거(더 이상 쓸 수 없는 자투리).
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.rects = {}
+        self._uid = 0
+
+    def add(self, sheet, x, y, w, h, min_side=0):
+        if w <= 0 or h <= 0 or min(w, h) < min_side:
+            return
+        self._uid += 1
+        self.rects[self._uid] = (sheet, x, y, w, h)
+        insort(self.keys, (w * h, self._uid))
+
+    def find(self, pw, ph, rotate, min_side=0):
+        """→ (번호, 회전 여부) 또는 None"""
+        i = bisect_left(self.keys, (pw * ph, 0))
+        while i < len(self.keys):
+            _, uid = self.keys[i]
+            _, _, _, w, h = self.rects[uid]
+            if min(w, h) < min_side:
+                del self.keys[i], self.rects[uid]
+                continue
+            fit = (pw <= w and ph <= h, rotate and ph <= w and pw <= h)
+            if fit[0] and fit[1]:
+                # 두 방향 모두 가능하면 짧은 변 여유가 작은 쪽
+                return uid, min(w - ph, h - pw) < min(w - pw, h - ph)
+            if fit[0] or fit[1]:
+                return uid, not fit[0]
+            i += 1
+        return None
+
+    def pop(self, uid):
+        sheet, x, y, w, h = self.rects.pop(uid)
+        del self.keys[bisect_left(self.keys, (w * h, uid))]
+        return sheet, x, y, w, h
+
+
+# -------------------------------------------------------------------
+# 2) 빠른 모드 – Guillotine Best-Area-Fit
+# -------------------------------------------------------------------
+def pack(parts, sheet=(SHEET_W, SHEET_L), kerf=0, rotate=True, split="short_axis"):
+    """
+    parts 순서대로 배치 (정렬은 호출 측)
+    → (원판별 배치 리스트, 원판에 들어가지 않는 부품 리스트)
+      배치: {"x", "y", "w", "l", "label", "rotated"}  (x: 폭 방향, y: 길이 방향, mm)
+    """
+    W, L = sheet[0] + kerf, sheet[1] + kerf   # 마지막 절단에는 톱날 폭이 필요 없음
+    free = FreeRects()
+    sheets, oversize = [], []
+
+    # 남은 부품 중 가장 짧은 변 (이보다 좁은 자유 사각형은 버림)
+    tail_min = [0] * (len(parts) + 1)
+    m = math.inf
+    for i in range(len(parts) - 1, -1, -1):
+        m = min(m, parts[i][0] + kerf, parts[i][1] + kerf)
+        tail_min[i] = m
+
+    for i, (pw, pl, label) in enumerate(parts):
+        w, h = pw + kerf, pl + kerf
+        if not ((w <= W and h <= L) or (rotate and h <= W and w <= L)):
+            oversize.append((pw, pl, label))
+            continue
+        hit = free.find(w, h, rotate, tail_min[i])
+        if hit is None:
+            sheets.append([])
+            free.add(len(sheets) - 1, 0, 0, W, L)
+            hit = free.find(w, h, rotate)
+        uid, rot = hit
+        s, x, y, fw, fh = free.pop(uid)
+        if rot:
+            w, h = h, w
+        sheets[s].append({"x": x, "y": y, "w": w - kerf, "l": h - kerf, "label": label, "rotated": rot})
+
+        # 남은 L자 영역을 두 사각형으로 분할
+        rw, rh = fw - w, fh - h
+        horizontal = (rw < rh) if split == "short_axis" else (rw >= rh)
+        nxt = tail_min[i + 1]
+        if horizontal:
+            free.add(s, x, y + h, fw, rh, nxt)
+            free.add(s, x + w, y, rw, h, nxt)
+        else:
+            free.add(s, x + w, y, rw, fh, nxt)
+            free.add(s, x, y + h, w, rh, nxt)
+    return sheets, oversize
+
+
+def _score(sheets):
+    """원판 수 → 가장 덜 찬 원판의 사용 면적(작을수록 다음 개선 여지)"""
+    if not sheets:
+        return (0, 0)
+    return (len(sheets), min(sum(p["w"] * p["l"] for p in s) for s in sheets))
+
+
+# -------------------------------------------------------------------
+# 3) 개선 모드
+# -------------------------------------------------------------------
+def improve(parts, sheet, kerf, rotate, target, time_limit=2.0, seed=0):
+    """
+    정렬 기준 × 분할 규칙 조합을 모두 시도한 뒤,
+    남은 시간 동안 최선 순서를 인접 교환으로 교란해 재시작 → 원판별 배치 리스트
+    """
+    deadline = time.perf_counter() + time_limit
+    best = None
+    for key in ORDERS.values():
+        order = sorted(parts, key=key, reverse=True)
+        for split in SPLITS:
+            sheets, _ = pack(order, sheet, kerf, rotate, split)
+            if best is None or _score(sheets) < best[0]:
+                best = (_score(sheets), sheets, order, split)
+            if len(sheets) <= target or time.perf_counter() >= deadline:
+                return best[1]
+
+    rng = random.Random(seed)
+    n = len(parts)
+    while n > 1 and best[0][0] > target and time.perf_counter() < deadline:
+        order = list(best[2])
+        for _ in range(max(1, n // 20)):
+            i = rng.randrange(n - 1)
+            order[i], order[i + 1] = order[i + 1], order[i]
+        sheets, _ = pack(order, sheet, kerf, rotate, best[3])
+        if _score(sheets) < best[0]:
+            best = (_score(sheets), sheets, order, best[3])
+    return best[1]
+
+
+# -------------------------------------------------------------------
+# 4) 진입점
+# -------------------------------------------------------------------
+def solve(parts, sheet=(SHEET_W, SHEET_L), kerf=0, rotate=True, do_improve=False, time_limit=2.0):
+    """
+    parts: [(폭, 길이, 라벨), ...]
+    → {"sheets", "oversize", "lower_bound", "utilization", "gap", "phase"}
+    """
+    with timing.span("nest_heuristic", parts=len(parts)):
+        order = sorted(parts, key=ORDERS["area"], reverse=True)
+        sheets, oversize = pack(order, sheet, kerf, rotate)
+    skip = set(oversize)
+    fit = [p for p in parts if p not in skip] if skip else parts
+    lb = lower_bound(fit, sheet, rotate)
+    phase = "heuristic"
+    if do_improve and len(sheets) > lb:
+        with timing.span("nest_improve"):
+            sheets = improve(fit, sheet, kerf, rotate, lb, time_limit)
+        phase = "improve"
+    elif len(sheets) <= lb:
+        phase = "bound"
+
+    used = sum(p["w"] * p["l"] for s in sheets for p in s)
+    total = len(sheets) * sheet[0] * sheet[1]
+    return {
+        "sheets": sheets,
+        "oversize": oversize,
+        "lower_bound": lb,
+        "utilization": round(used / total * 100, 2) if total else 0.0,
+        "gap": len(sheets) - lb,
+        "phase": phase,
+    }
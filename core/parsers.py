@@ -0,0 +1,125 @@
+"""
+벡터화 파서 (pandas .str 연산)
+
+– 파이프 절단 리스트: Length(mm), Qty
+– 슬리팅 최적화(3번 페이지): 품명 "0.75Tx437"(+ 주문 kg), LOT "SPCC750 1250"
+– 코일 슬리팅(5번 페이지): LOT "CR060 1038C11200 250306-1", 품명 "... 0.75x437(CR)"
+– 반복 값이 많은 열(vendor, LOT 재질)은 category, 폭은 int32
+"""
+
+import numpy as np
+import pandas as pd
+
+NAME_DIM_RE = r"(\d+(?:\.\d+)?)[Tt]?[xX×](\d+(?:\.\d+)?)"
+COIL_LOT_RE = r"^([A-Z]+?)(\d{3})\s+(\d+)[A-Za-z]\d+\s+(\d{6})-(\d+)$"
+PRODUCT_MAT_RE = r"\((CR|HR|HGI)\)\s*$"
+PRODUCT_DIM_RE = r"(\d+(?:\.\d+)?)[Tt]?x(\d+)"
+
+
+def pick_columns(df, names):
+    """이름이 맞는 열 우선, 없으면 앞에서부터 위치로 대응"""
+    if all(n in df.columns for n in names):
+        return df[names]
+    out = df.iloc[:, :len(names)].copy()
+    out.columns = names[:out.shape[1]]
+    return out
+
+
+# -------------------------------------------------------------------
+# 1) 파이프 절단 리스트
+# -------------------------------------------------------------------
+def parse_cut_list(df):
+    df = pick_columns(df, ["Length(mm)", "Qty"]).copy()
+    df["Length(mm)"] = pd.to_numeric(df["Length(mm)"], errors="coerce")
+    df["Qty"] = pd.to_numeric(df["Qty"], errors="coerce")
+    df = df.dropna().astype(int)
+    return df[df["Qty"] > 0]
+
+
+# -------------------------------------------------------------------
+# 2) 슬리팅 최적화 – 품명 / LOT
+# -------------------------------------------------------------------
+def _name_dims(names):
+    """품명 Series → (thickness, width 프레임, 유효 행 마스크) – 입력과 같은 인덱스"""
+    nm = names.astype(str).str.strip().str.upper()
+    dims = nm.str.extract(NAME_DIM_RE)
+    out = pd.DataFrame({
+        "thickness": pd.to_numeric(dims[0], errors="coerce"),
+        "width": pd.to_numeric(dims[1], errors="coerce"),
+    })
+    return out, ~nm.str.startswith("LOSS") & out.notna().all(axis=1)
+
+
+def parse_names(names):
+    """품명 Series → thickness, width, thk_id (LOSS 행·형식 오류 행 제외)"""
+    out, keep = _name_dims(names)
+    out = out[keep].reset_index(drop=True)
+    out["thk_id"] = (out["thickness"] * 1000).round().astype(int)
+    return out
+
+
+def parse_orders(df):
+    """
+    주문 표(첫 열 품명, 둘째 열 kg – 선택) → thickness, width, thk_id, demand, demand_kg
+    demand는 행마다 스트립 1개, demand_kg는 둘째 열이 없거나 비면 NaN
+    """
+    out, keep = _name_dims(df.iloc[:, 0])
+    kg = df.iloc[:, 1].astype(str).str.replace(",", "") if df.shape[1] > 1 else pd.Series(index=df.index, dtype=str)
+    out["demand_kg"] = pd.to_numeric(kg, errors="coerce")
+    out = out[keep].reset_index(drop=True)
+    out["thk_id"] = (out["thickness"] * 1000).round().astype(int)
+    out["demand"] = 1
+    return out
+
+
+def parse_lot_list(df):
+    """LOT_NO("SPCC750 1250"), weight, vendor → 재고 프레임"""
+    df = pick_columns(df, ["LOT_NO", "weight", "vendor"])
+    lot = df["LOT_NO"].astype(str).str.strip()
+    tok = lot.str.split()
+    mt = tok.str[0].str.extract(r"([A-Z]+)(\d+)")
+    stock = pd.DataFrame({
+        "coil_id": lot,
+        "vendor": df["vendor"].astype("category"),
+        "thickness": (mt[1].astype(int) / 100).round(2),
+        "width": tok.str[1].str.extract(r"(\d{3,4})")[0].astype(np.int32),
+        "weight": df["weight"].astype(str).str.replace(",", "").astype(float),
+        "qty": 1,
+    })
+    stock["thk_id"] = (stock["thickness"] * 1000).round().astype(int)
+    return stock
+
+
+# -------------------------------------------------------------------
+# 3) 코일 슬리팅 – LOT / 품명
+# -------------------------------------------------------------------
+def parse_coil_lots(lots):
+    """LOT Series → material, thickness_mm, width_mm, production_date, sequence (형식 오류 행은 NaN)"""
+    lots = lots.astype(str).str.strip()
+    m = lots.str.extract(COIL_LOT_RE)
+    return pd.DataFrame({
+        "coil_lot_no": lots,
+        "material": m[0].astype("category"),
+        "thickness_mm": pd.to_numeric(m[1], errors="coerce") / 100,
+        "width_mm": pd.to_numeric(m[2], errors="coerce").astype("Int64"),
+        "production_date": pd.to_datetime(m[3], format="%y%m%d", errors="coerce").dt.date,
+        "sequence": pd.to_numeric(m[4], errors="coerce").astype("Int64"),
+    })
+
+
+def parse_product_names(names):
+    """품명 Series → raw_name, product, thickness_mm, width_mm, material"""
+    raw = names.astype(str)
+    name = raw.str.strip()
+    mat = name.str.extract(PRODUCT_MAT_RE)[0]
+    core = name.str.replace(PRODUCT_MAT_RE, "", regex=True).str.strip()
+    dims = core.str.extract(PRODUCT_DIM_RE)
+    thk = pd.to_numeric(dims[0], errors="coerce")
+    default = pd.Series(["CR"] * len(thk), index=thk.index).where(thk < 1.2, "HR").where(thk.notna())
+    return pd.DataFrame({
+        "raw_name": raw,
+        "product": core,
+        "thickness_mm": thk,
+        "width_mm": pd.to_numeric(dims[1], errors="coerce").astype("Int64"),
+        "material": mat.fillna(default),
+    })
@@ -0,0 +1,309 @@
+"""
+파이프 절단 엔진 (1D Cutting Stock)
+
+– FFD(First-Fit-Decreasing) 패킹
+– 하한(lower bound): 연속 하한 ceil(sum/eff_len), Martello–Toth L2
+– 개선 단계: FFD 결과가 하한에 도달하지 못한 경우에만 실행
+– 잔재 우선 사용: 보관 중인 잔재에 Best-Fit-Decreasing으로 먼저 배치
+– 패턴 축소: 막대 수 허용 범위 안에서 서로 다른 패턴(톱 세팅) 수 최소화
+– 막대는 __slots__ 객체(Bar) – 막대마다 dict를 두지 않아 대량 계획의 메모리 절약
+"""
+
+import time
+from collections import Counter
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+
+import pandas as pd
+
+from core import timing
+
+
+class Bar:
+    """막대 1개: 조각 길이(cuts), 남은 길이(remain). 잔재 막대는 remnant_id, length(원래 길이)"""
+    __slots__ = ("cuts", "remain", "remnant_id", "length")
+
+    def __init__(self, cuts, remain, remnant_id=None, length=None):
+        self.cuts = cuts
+        self.remain = remain
+        self.remnant_id = remnant_id
+        self.length = length
+
+    def copy(self):
+        return Bar(list(self.cuts), self.remain, self.remnant_id, self.length)
+
+    def __repr__(self):
+        return f"Bar(cuts={self.cuts}, remain={self.remain})"
+
+
+# -------------------------------------------------------------------
+# 1) FFD
+# -------------------------------------------------------------------
+def expand_pieces(lengths, qtys):
+    """(길이, 수량) → 내림차순 조각 리스트"""
+    pieces = [l for l, q in zip(lengths, qtys) for _ in range(q)]
+    pieces.sort(reverse=True)
+    return pieces
+
+
+def ffd(pieces, eff_len):
+    """pieces는 내림차순 정렬되어 있어야 함"""
+    bars = []
+    for p in pieces:
+        for bar in bars:
+            if bar.remain >= p:
+                bar.cuts.append(p)
+                bar.remain -= p
+                break
+        else:
+            bars.append(Bar([p], eff_len - p))
+    return bars
+
+
+# -------------------------------------------------------------------
+# 2) 하한
+# -------------------------------------------------------------------
+def lb_continuous(pieces, eff_len):
+    """연속 하한: ceil(sum / eff_len)"""
+    return -(-sum(pieces) // eff_len) if pieces else 0
+
+
+def lb_l2(pieces, eff_len):
+    """
+    Martello–Toth L2 하한. k ∈ {0} ∪ {p ≤ C/2} 에 대해
+      J1 = p > C-k,  J2 = C/2 < p ≤ C-k,  J3 = k ≤ p ≤ C/2
+      L(k) = |J1| + |J2| + max(0, ceil((ΣJ3 - (|J2|·C - ΣJ2)) / C))
+    정렬 + 누적합으로 O(n log n)
+    """
+    if not pieces:
+        return 0
+    C = eff_len
+    asc = sorted(pieces)
+    n = len(asc)
+    prefix = [0, *accumulate(asc)]
+    i_half = bisect_right(asc, C / 2)
+
+    best = 0
+    for k in {0, *asc[:i_half]}:
+        i_ck = bisect_right(asc, C - k)
+        i_k = bisect_left(asc, k)
+        n1 = n - i_ck
+        n2 = max(i_ck - i_half, 0)
+        s2 = prefix[i_ck] - prefix[i_half] if n2 else 0
+        s3 = prefix[i_half] - prefix[i_k]
+        free = n2 * C - s2
+        best = max(best, n1 + n2 + max(0, -(-(s3 - free) // C)))
+    return best
+
+
+def lower_bound(pieces, eff_len):
+    return max(lb_continuous(pieces, eff_len), lb_l2(pieces, eff_len))
+
+
+# -------------------------------------------------------------------
+# 3) 개선 단계 – 막대 제거 (Best-Fit 재배치 + 1:1 교환)
+# -------------------------------------------------------------------
+def _try_empty(bars, idx, eff_len):
+    """idx번 막대를 비우고 조각을 나머지 막대로 옮겨본다. 실패 시 None"""
+    rest = [b for i, b in enumerate(bars) if i != idx]
+    owned = set()   # 이번 시도에서 바꾼 막대만 복사 (실패하면 원래 막대는 그대로)
+
+    def own(j):
+        if j not in owned:
+            rest[j] = rest[j].copy()
+            owned.add(j)
+        return rest[j]
+
+    pool = sorted(bars[idx].cuts, reverse=True)
+
+    while pool:
+        p = pool.pop(0)
+        fit = [j for j, b in enumerate(rest) if b.remain >= p]
+        if fit:
+            b = own(min(fit, key=lambda j: rest[j].remain))
+            b.cuts.append(p)
+            b.remain -= p
+            continue
+
+        # 더 작은 조각과 교환 → 떠도는 조각이 계속 작아지므로 반드시 종료
+        swap = None
+        for j, b in enumerate(rest):
+            need = p - b.remain   # 이 막대에서 빼야 할 최소 길이
+            for q in b.cuts:
+                if need <= q < p and (swap is None or q - need < swap[0]):
+                    swap = (q - need, j, q)
+        if swap is None:
+            return None
+        left, j, q = swap
+        b = own(j)
+        b.cuts.remove(q)
+        b.cuts.append(p)
+        b.remain = left
+        pool.append(q)
+        pool.sort(reverse=True)
+    return rest
+
+
+def improve(bars, eff_len, target=0, time_limit=2.0):
+    """막대 수가 target(하한)에 도달하거나 시간 초과 시 중단"""
+    deadline = time.perf_counter() + time_limit
+    bars = list(bars)
+    improved = True
+    while improved and len(bars) > target and time.perf_counter() < deadline:
+        improved = False
+        order = sorted(range(len(bars)), key=lambda i: bars[i].remain, reverse=True)
+        for i in order:
+            if time.perf_counter() >= deadline:
+                break
+            trial = _try_empty(bars, i, eff_len)
+            if trial is not None:
+                bars = trial
+                improved = True
+                break
+    for b in bars:
+        b.cuts.sort(reverse=True)
+    return bars
+
+
+# -------------------------------------------------------------------
+# 4) 잔재 우선 배치
+# -------------------------------------------------------------------
+def pack_remnants(pieces, remnants, chuck_len):
+    """
+    remnants: [(id, length), ...]
+    잔여 용량 정렬 리스트 + bisect로 가장 작은 잔재부터 채운다 (Best-Fit-Decreasing).
+    → (잔재 막대 리스트, 잔재에 못 들어간 조각 리스트)
+    """
+    caps = sorted((length - chuck_len, i) for i, (_, length) in enumerate(remnants) if length > chuck_len)
+    used = {}
+    left = []
+    for p in pieces:
+        j = bisect_left(caps, (p, -1))
+        if j == len(caps):
+            left.append(p)
+            continue
+        cap, i = caps.pop(j)
+        rid, length = remnants[i]
+        bar = used.get(i)
+        if bar is None:
+            bar = used[i] = Bar([], cap, rid, length)
+        bar.cuts.append(p)
+        bar.remain = cap - p
+        insort(caps, (cap - p, i))
+    return list(used.values()), left
+
+
+def new_remnants(bars, chuck_len, min_len):
+    """절단 후 실물 잔재 길이(remain + chuck) 중 min_len 이상"""
+    return [b.remain + chuck_len for b in bars if b.remain + chuck_len >= min_len]
+
+
+# -------------------------------------------------------------------
+# 5) 패턴 축소 (세팅 최소화) – Sequential Heuristic
+# -------------------------------------------------------------------
+def pat_key(bar):
+    return tuple(sorted(bar.cuts, reverse=True))
+
+
+def _best_pattern(demand, pool, aspiration):
+    """남은 수요로 반복 가능한 횟수(m)가 가장 큰 패턴. 사용 길이 < aspiration 은 제외"""
+    best = None
+    for pat in pool:
+        used = sum(pat)
+        if used < aspiration:
+            continue
+        need = Counter(pat)
+        m = min(demand[l] // c for l, c in need.items())
+        if m and (best is None or (m, used) > best[:2]):
+            best = (m, used, pat, need)
+    return best
+
+
+def _sequential(demand, eff_len, pool, aspiration):
+    demand = Counter(demand)
+    pool = set(pool)
+    plan = Counter()
+    while +demand:
+        best = _best_pattern(demand, pool, aspiration)
+        if best is None:
+            # 남은 수요를 FFD로 묶어 새 패턴 후보를 만든다 (하한 없이 선택)
+            fresh = {pat_key(b) for b in ffd(sorted(demand.elements(), reverse=True), eff_len)}
+            pool |= fresh
+            best = _best_pattern(demand, fresh, float("-inf"))
+        m, _, pat, need = best
+        plan[pat] += m
+        for l, c in need.items():
+            demand[l] -= c * m
+    return plan
+
+
+def plan_cost(plan, setup_min, cycle_min):
+    """현장 소요시간(분) = 세팅 수 × 세팅시간 + 막대 수 × 사이클시간"""
+    return len(plan) * setup_min + sum(plan.values()) * cycle_min
+
+
+def reduce_patterns(bars, eff_len, max_extra=0, setup_min=10.0, cycle_min=1.0):
+    """
+    FFD/개선 결과(bars)를 출발점으로, 여러 낭비 허용 수준(aspiration)에서
+    순차 패턴 생성 → 막대 수 ≤ 기존 + max_extra 인 계획 중 소요시간 최소를 선택.
+    """
+    base = Counter(pat_key(b) for b in bars)
+    demand = Counter(c for b in bars for c in b.cuts)
+    limit = sum(base.values()) + max_extra
+
+    best = base
+    for f in (0.0, 0.01, 0.02, 0.03, 0.05, 0.08, 0.12, 0.2, 0.3):
+        plan = _sequential(demand, eff_len, base, eff_len * (1 - f))
+        if sum(plan.values()) <= limit and plan_cost(plan, setup_min, cycle_min) < plan_cost(best, setup_min, cycle_min):
+            best = plan
+
+    return [Bar(list(pat), eff_len - sum(pat)) for pat, q in best.items() for _ in range(q)]
+
+
+# -------------------------------------------------------------------
+# 6) 통합 실행
+# -------------------------------------------------------------------
+def solve(pieces, eff_len, do_improve=True, time_limit=2.0):
+    """
+    FFD → 하한 비교 → (필요 시) 개선 단계
+    FFD가 하한과 같으면 최적이 증명되므로 개선 단계를 건너뛴다.
+    """
+    with timing.span("ffd", pieces=len(pieces)):
+        bars = ffd(pieces, eff_len)
+    with timing.span("lower_bound"):
+        lb1 = lb_continuous(pieces, eff_len)
+        lb2 = lb_l2(pieces, eff_len)
+    lb = max(lb1, lb2)
+    phase = "ffd"
+    if do_improve and len(bars) > lb:
+        with timing.span("improve"):
+            better = improve(bars, eff_len, target=lb, time_limit=time_limit)
+        if len(better) < len(bars):
+            bars, phase = better, "improve"
+    return {
+        "bars": bars,
+        "lb_continuous": lb1,
+        "lb_l2": lb2,
+        "lower_bound": lb,
+        "gap": len(bars) - lb,
+        "gap_pct": (len(bars) - lb) / lb * 100 if lb else 0.0,
+        "optimal": len(bars) == lb,
+        "phase": phase,
+    }
+
+
+def pattern_table(pattern_dict, eff_len, chuck_len):
+    """패턴 → 결과 표 (cutting_patterns.csv 열)"""
+    rows = []
+    for i, (pat, qty) in enumerate(pattern_dict.items(), 1):
+        used = sum(pat)
+        remain = eff_len - used
+        rows.append({
+            "#": i,
+            "Quantity": qty,
+            "Cuts": ", ".join(map(str, pat)),
+            "Used(mm)": used,
+            "Remain(mm)": remain,
+            "Waste(mm)": remain + chuck_len
+        })
+    return pd.DataFrame(rows)
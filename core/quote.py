@@ -0,0 +1,392 @@
+"""
+견적 요청 계산 (원자재 견적요청 페이지)
+
+– 품명 → 형태/재질 분류, 스펙 추출, 단중 계산, 공급처 매핑
+– QuoteBook: 에디터 변경 행만 다시 계산하고 공급처 그룹을 증분 갱신
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+# ─────────────────────────────────────────────────────────
+# 1) C형강 / ㄷ형강 무게표 (10m 기준, kg)
+# ─────────────────────────────────────────────────────────
+weights = {
+    "C형강": {
+        "60×30×10×1.6": 16.3,
+        "60×30×10×2.0": 19.9,
+        "60×30×10×2.3": 22.5,
+        "75×45×15×1.6": 23.2,
+        "75×45×15×2.0": 28.6,
+        "75×45×15×2.3": 32.5,
+        "75×45×20×2.0": 35.6,
+        "75×45×20×2.3": 40.6,
+        "100×50×20×1.6": 28.8,
+        "100×50×20×2.0": 35.6,
+        "100×50×20×2.3": 40.6,
+        "100×50×20×2.6": 45.5,
+        "100×50×20×3.2": 55.0,
+        "125×50×20×2.0": 39.5,
+        "125×50×20×2.3": 45.1,
+        "125×50×20×3.2": 61.3,
+        "150×50×20×3.2": 67.6,
+        "150×65×20×3.2": 75.1,
+        "150×65×20×4.0": 92.2,
+        "150×65×20×4.5": 103.0,
+        "150×75×20×3.2": 82.7,
+        "200×75×20×3.2": 92.7,
+        "200×75×20×4.0": 127.0,
+        "200×75×20×4.5": 140.0,
+        "200×75×25×3.2": 95.2,
+        "200×75×25×4.0": 117.0,
+        "200×75×25×4.5": 131.0,
+        "200×80×20×4.0": 133.0,
+        "200×80×20×4.5": 149.0
+    },
+    "ㄷ형강": {
+        "75×40 (5.0/7.0)": 69.2,
+        "100×50 (5.0/7.5)": 93.6,
+        "125×65 (6.0/8.0)": 134.0,
+        "150×75 (6.5/10.0)": 186.0,
+        "150×75 (9.0/12.5)": 240.0,
+        "200×80 (7.5/11.0)": 246.0,
+        "200×90 (8.0/13.5)": 303.0,
+        "250×90 (9.0/13.0)": 346.0,
+        "250×90 (11.0/14.5)": 402.0,
+        "300×90 (9.0/13.0)": 381.0,
+        "300×90 (10.0/15.5)": 438.0,
+        "300×90 (12.0/16.0)": 486.0,
+        "380×100 (10.5/16.0)": 545.0,
+        "380×100 (13.0/16.5)": 620.0,
+        "380×100 (13.0/20.0)": 673.0
+    }
+}
+
+# ─────────────────────────────────────────────────────────
+# 2) 스펙 추출 함수
+# ─────────────────────────────────────────────────────────
+def extract_spec(name: str, form: str) -> str:
+    # 공백 제거 · 대문자 통일 · ascii x, X, * → 유니코드 × 로 치환
+    nm = name.upper().replace(" ", "")
+    nm = nm.replace("X", "×").replace("x", "×").replace("*", "×")
+
+    if form == "C형강":
+        m = re.search(
+            r"(\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[tT]?",
+            nm
+        )
+        if m:
+            return f"{m.group(1)}×{m.group(2)}×{m.group(3)}×{m.group(4)}"
+
+    elif form == "ㄷ형강":
+        # ── ① 괄호 없는 네 숫자 (예: 100×50×5×7.5t) ──
+        tmp = re.sub(r"[tT]", "", nm)
+        m1 = re.search(
+            r"(\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)",
+            tmp
+        )
+        if m1:
+            d1, d2, v1, v2 = m1.groups()
+            return f"{d1}×{d2} ({float(v1):.1f}/{float(v2):.1f})"
+
+        # ── ② 기존 괄호+슬래시 패턴 ──
+        m2 = re.search(
+            r"(\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[(](\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)[)]",
+            nm
+        )
+        if m2:
+            return f"{m2.group(1)}×{m2.group(2)} ({float(m2.group(3)):.1f}/{float(m2.group(4)):.1f})"
+
+    elif form == "원형파이프":
+        m = re.search(
+            r"Ø?(\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)[tT]?",
+            nm
+        )
+        if m:
+            return f"Ø{m.group(1)}×{m.group(2)}"
+
+    elif form == "각파이프":
+        m = re.search(
+            r"(\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)(?:[×](\d+(?:\.\d+)?))?",
+            nm
+        )
+        if m:
+            parts = [m.group(1), m.group(2)]
+            if m.group(3):
+                parts.append(m.group(3))
+            return "×".join(parts)
+
+    # 시트판 패턴은 기존 코드 그대로 처리
+    return None
+
+# ─────────────────────────────────────────────────────────
+# 3) 중량 계산 보조 함수
+# ─────────────────────────────────────────────────────────
+def calc_round_pipe_weight(d_mm: float, t_mm: float, length_mm: float) -> float:
+    density = 7.85e-6
+    id_mm = d_mm - 2 * t_mm
+    if id_mm <= 0:
+        return 0.0
+    cross = math.pi/4 * (d_mm**2 - id_mm**2)
+    return round(cross * length_mm * density, 2)
+
+def calc_rect_pipe_weight(w_mm: float, h_mm: float, t_mm: float, length_mm: float) -> float:
+    density = 7.85e-6
+    inner_w = w_mm - 2 * t_mm
+    inner_h = h_mm - 2 * t_mm
+    if inner_w <= 0 or inner_h <= 0:
+        return 0.0
+    cross = (w_mm * h_mm) - (inner_w * inner_h)
+    return round(cross * length_mm * density, 2)
+
+def extract_dimensions(name: str):
+    # ① 공백 제거 · 대문자 통일
+    nm = name.upper().replace(" ", "")
+    # ② ascii x/X/* 문자를 유니코드 × 로 통일
+    nm = nm.replace("X", "×").replace("x", "×").replace("*", "×")
+
+    # ③ 'T×폭×길이' 패턴 매칭
+    m = re.search(r"(\d+(?:\.\d+)?)T×(\d+(?:\.\d+)?)[×](\d+(?:\.\d+)?)", nm)
+    if m:
+        return float(m.group(1)), float(m.group(2)), float(m.group(3))
+    return None, None, None
+
+
+def calc_sheet_weight(t: float, w: float, l: float) -> float:
+    return round(t * w * l * 7.85 / 1_000_000, 2)
+
+def calculate_weight(form: str, spec: str) -> float:
+    # ① 테이블 우선
+    if form in weights and spec in weights[form]:
+        return weights[form][spec]
+    # ② 원형파이프 (6m)
+    if form == "원형파이프" and spec:
+        d, t = map(float, spec.replace("Ø", "").split("×"))
+        return calc_round_pipe_weight(d, t, 6000)
+    # ③ 각파이프 (6m)
+    if form == "각파이프" and spec:
+        parts = list(map(float, spec.split("×")))
+        return calc_rect_pipe_weight(parts[0], parts[1], parts[2] if len(parts) > 2 else 0, 6000)
+    return None
+
+# ─────────────────────────────────────────────────────────
+# 4) 분류 & 공급처
+# ─────────────────────────────────────────────────────────
+def classify_form(name: str) -> str:
+    nm = name.upper()
+    if "C형강" in nm:
+        return "C형강"
+    if "ㄷ형강" in nm:
+        return "ㄷ형강"
+    if any(k in nm for k in ["각파이프", "각관"]):
+        return "각파이프"
+    if any(k in nm for k in ["원형파이프", "Ø"]):
+        return "원형파이프"
+    if "시트판" in nm:
+        return "시트판"
+    return "기타"
+
+def classify_type(name: str) -> str:
+    nm = name.upper()
+    if "HR" in nm or "HGI" in nm:
+        return "HR"
+    if "CR" in nm or "EGI" in nm:
+        return "CR"
+    return "기타"
+
+def get_vendors(form: str, mat: str, name: str) -> list:
+    s = name.replace("x", "×").upper()
+    if form in ["각파이프", "원형파이프"] and any(x in s for x in ["27×70", "70×27"]):
+        return ["경안파이프"]
+    if form in ["C형강", "ㄷ형강"]:
+        v = ["백산철강", "태강스틸"]
+        if mat == "HR":
+            v.append("유민철강")
+        return v
+    if form in ["각파이프", "원형파이프"]:
+        v = ["백산철강", "태강스틸"]
+        if mat == "HR":
+            v.append("유민철강")
+        return v
+    if form == "시트판":
+        return (["문배철강", "태창철강", "지오스틸", "경북코일센터", "신영스틸", "성주에스티"]
+                if mat == "HR"
+                else ["금강철강", "창화철강", "기보스틸", "영진철강", "애니스틸"])
+    return []
+
+# ─────────────────────────────────────────────────────────
+# 5) 행 단위 계산
+# ─────────────────────────────────────────────────────────
+def quote_row(name, qty_raw, unit_raw):
+    """
+    에디터 한 행 → (품명, 견적 문장, 공급처 목록, 중량 미확인 여부)
+    계산 대상이 아니면 None
+    """
+    name = str(name).strip()
+    if not name:
+        return None
+    if pd.isna(qty_raw) or pd.isna(unit_raw):
+        return None
+    unit = str(unit_raw).lower()
+    if unit not in ("ea", "kg"):
+        return None
+    try:
+        qty = float(qty_raw)
+    except:
+        return None
+
+    form = classify_form(name)
+    mat  = classify_type(name)
+    spec = extract_spec(name, form)
+    wt   = 0.0
+    missing = False
+
+    if form == "시트판":
+        t, w, l = extract_dimensions(name)
+        if t and w and l:
+            wt = calc_sheet_weight(t, w, l)
+            if unit == "kg":
+                total = qty
+                pcs = int(round(total / wt)) if wt else 0
+            else:
+                pcs = int(qty)
+                total = round(pcs * wt, 2)
+        else:
+            pcs, total = 0, 0.0
+    else:
+        w_calc = calculate_weight(form, spec)
+        if w_calc is not None:
+            wt = w_calc
+            if unit == "kg":
+                total = qty
+                pcs = int(round(total / wt)) if wt else 0
+            else:
+                pcs = int(qty)
+                total = round(pcs * wt, 2)
+        else:
+            missing = True
+            pcs, total = 0, 0.0
+
+    return name, f"{name} {pcs}EA (총 {total}kg)", tuple(get_vendors(form, mat, name)), missing
+
+
+def sheet_parts(rows):
+    """
+    에디터 행 → 시트판 부품 묶음 {(두께, 재질): [(폭, 길이, 수량, 품명), ...]}
+    kg 단위는 장당 중량으로 수량 환산
+    """
+    groups = defaultdict(list)
+    for name, qty_raw, unit_raw in rows:
+        name = str(name).strip()
+        if not name or classify_form(name) != "시트판":
+            continue
+        t, w, l = extract_dimensions(name)
+        try:
+            qty = float(qty_raw)
+        except (TypeError, ValueError):
+            continue
+        if not (t and w and l) or qty != qty or qty <= 0:
+            continue
+        if str(unit_raw).lower() == "kg":
+            wt = calc_sheet_weight(t, w, l)
+            if wt <= 0:
+                continue
+            qty = round(qty / wt)
+        if qty > 0:
+            groups[(t, classify_type(name))].append((w, l, int(qty), name))
+    return dict(groups)
+
+
+# ─────────────────────────────────────────────────────────
+# 6) 증분 견적 장부
+# ─────────────────────────────────────────────────────────
+class QuoteBook:
+    """
+    행 위치별 계산 결과를 보관하고, 바뀐 행만 다시 계산해
+    item_to_text / vendor_to_items / 공급처 그룹을 증분 갱신한다.
+    """
+
+    def __init__(self):
+        self.rows = []                              # 위치 → (행 입력, 결과)
+        self.item_to_text = {}
+        self.name_count = Counter()
+        self.vendor_to_items = defaultdict(Counter)  # 공급처 → 품명 카운터
+        self._vendor_key = {}                        # 공급처 → 정렬된 품목 튜플
+        self._dirty = {}                             # 순서 유지용 dict
+        self._names = {}                             # item_to_text를 다시 정할 품명
+
+    def _apply(self, res, sign):
+        if res is None:
+            return
+        name, _, vendors, _ = res
+        self.name_count[name] += sign
+        if self.name_count[name] <= 0:
+            del self.name_count[name]
+            self.item_to_text.pop(name, None)
+        else:
+            self._names[name] = None
+        for v in vendors:
+            items = self.vendor_to_items[v]
+            items[name] += sign
+            if items[name] <= 0:
+                del items[name]
+            self._dirty[v] = None
+
+    def update(self, rows, changed=None):
+        """
+        rows: [(품명, 수량, 단위), ...] 현재 에디터 행
+        changed: 바뀐 행 위치 (None이면 이전 입력과 비교)
+        """
+        n = len(rows)
+        for i in range(n, len(self.rows)):
+            self._apply(self.rows[i][1], -1)
+        del self.rows[n:]
+        if changed is None:
+            changed = range(n)
+        for i in sorted(set(changed) | set(range(len(self.rows), n))):
+            if i >= n:
+                continue
+            key = tuple(rows[i])
+            if i < len(self.rows):
+                if self.rows[i][0] == key:
+                    continue
+                self._apply(self.rows[i][1], -1)
+            res = quote_row(*key)
+            self._apply(res, +1)
+            if i < len(self.rows):
+                self.rows[i] = (key, res)
+            else:
+                self.rows.append((key, res))
+        self._refresh_text()
+
+    def _refresh_text(self):
+        """같은 품명이 여러 행이면 남아 있는 마지막 행의 문구 (전체 재계산과 같은 결과)"""
+        names = {n for n in self._names if n in self.name_count}
+        self._names.clear()
+        for _, res in reversed(self.rows):
+            if not names:
+                break
+            if res is not None and res[0] in names:
+                self.item_to_text[res[0]] = res[1]
+                names.discard(res[0])
+
+    def missing(self):
+        return [r[1][0] for r in self.rows if r[1] is not None and r[1][3]]
+
+    def grouped(self):
+        """품목 묶음(튜플) → 공급처 목록. 바뀐 공급처만 다시 정렬"""
+        for v in self._dirty:
+            items = self.vendor_to_items.get(v)
+            if items:
+                self._vendor_key[v] = tuple(sorted(items))
+            else:
+                self._vendor_key.pop(v, None)
+                self.vendor_to_items.pop(v, None)
+        self._dirty.clear()
+        grouped = defaultdict(list)
+        for v, key in self._vendor_key.items():
+            grouped[key].append(v)
+        return grouped
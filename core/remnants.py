@@ -0,0 +1,64 @@
+"""
+잔재(Offcut) 재고 – SQLite 저장소
+
+– (spec, length) 인덱스로 길이 범위 조회
+– 절단 후 남은 잔재 등록 / 사용한 잔재 차감
+– 연결 하나를 여러 세션(스레드)이 같이 써도 되도록 잠금으로 직렬화 (페이지에서 cache_resource로 공유)
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+
+DB_FILE = "remnants.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS remnants (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    spec       TEXT    NOT NULL DEFAULT '',
+    length     INTEGER NOT NULL,
+    created_at TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_remnants_spec_length ON remnants(spec, length);
+"""
+
+
+class RemnantStore:
+    def __init__(self, path=DB_FILE):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def available(self, spec="", min_len=0, max_len=None):
+        """길이 범위 조회 (인덱스 사용) → [(id, length), ...] 길이 오름차순"""
+        sql = "SELECT id, length FROM remnants WHERE spec = ? AND length >= ?"
+        args = [spec, min_len]
+        if max_len is not None:
+            sql += " AND length <= ?"
+            args.append(max_len)
+        with self.lock:
+            return self.conn.execute(sql + " ORDER BY length", args).fetchall()
+
+    def add(self, lengths, spec=""):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO remnants (spec, length, created_at) VALUES (?, ?, ?)",
+                [(spec, int(l), now) for l in lengths],
+            )
+
+    def consume(self, ids):
+        with self.lock, self.conn:
+            self.conn.executemany("DELETE FROM remnants WHERE id = ?", [(int(i),) for i in ids])
+
+    def summary(self, spec=""):
+        """길이별 수량"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT length, COUNT(*) FROM remnants WHERE spec = ? GROUP BY length ORDER BY length DESC",
+                (spec,),
+            ).fetchall()
+
+    def clear(self, spec=""):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM remnants WHERE spec = ?", (spec,))
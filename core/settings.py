@@ -0,0 +1,139 @@
+"""
+페이지 설정 저장소 (JSON 파일, 여러 사용자 공용 서버용)
+
+– 페이지마다 파일 하나, 파일 안에서 사용자별로 나눠 저장 {"users": {"default": {...}, "kim": {...}}}
+  예전 형식(평평한 dict) 파일은 "default" 사용자 설정으로 읽는다
+– 읽기: 프로세스 메모리 캐시, 파일 mtime/크기가 바뀌었을 때만 다시 읽음
+– 쓰기: 값이 바뀐 경우에만. 파일 잠금 → 디스크 최신본 다시 읽기 → 바뀐 키만 반영
+  → 임시 파일에 쓰고 os.replace (중간에 끊겨도 반쯤 쓴 파일이 남지 않음)
+"""
+
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+DEFAULT_USER = "default"
+
+_cache = {}   # 절대 경로 → ((mtime_ns, size), data)
+_mutex = threading.Lock()
+
+
+@contextmanager
+def _file_lock(path):
+    """<path>.lock 배타 잠금 (다른 프로세스 포함)"""
+    with open(path + ".lock", "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:   # LK_LOCK은 약 10초 재시도 후 실패 → 계속 대기
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read(path):
+    """파일 → {"users": {...}} (없거나 깨졌으면 빈 설정, 예전 형식은 default 사용자로)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"users": {}}
+    if not isinstance(data, dict):
+        return {"users": {}}
+    if not isinstance(data.get("users"), dict):
+        data = {"users": {DEFAULT_USER: data}}
+    return data
+
+
+def _load(path):
+    stamp = _stamp(path)
+    with _mutex:
+        hit = _cache.get(path)
+        if hit and hit[0] == stamp:
+            return hit[1]
+    data = _read(path)
+    with _mutex:
+        _cache[path] = (stamp, data)
+    return data
+
+
+def _write(path, data):
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                               dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class SettingsStore:
+    def __init__(self, path, defaults=None):
+        self.path = os.path.abspath(path)
+        self.defaults = dict(defaults or {})
+
+    def get(self, user=DEFAULT_USER):
+        """기본값 + 사용자 설정 (복사본 – 고쳐도 저장소에는 영향 없음)"""
+        return {**self.defaults, **_load(self.path)["users"].get(user, {})}
+
+    def update(self, values, user=DEFAULT_USER):
+        """
+        바뀐 키만 저장. 아무것도 안 바뀌었으면 파일을 건드리지 않는다 → 저장 여부
+        잠금 안에서 디스크 최신본에 반영하므로 다른 세션이 바꾼 키를 덮어쓰지 않는다.
+        """
+        current = self.get(user)
+        changed = {k: v for k, v in values.items() if current.get(k) != v}
+        if not changed:
+            return False
+        with _file_lock(self.path):
+            data = _read(self.path)
+            data["users"].setdefault(user, {}).update(changed)
+            _write(self.path, data)
+            stamp = _stamp(self.path)
+        with _mutex:
+            _cache[self.path] = (stamp, data)
+        return True
+
+
+def current_user():
+    """
+    Streamlit 로그인 사용자(이메일) → 주소의 ?user= → "default"
+    로그인 기능을 쓰지 않는 사내 서버에서는 즐겨찾기 주소에 ?user=이름 을 붙여 구분한다.
+    """
+    import streamlit as st
+
+    try:
+        if st.user.get("is_logged_in") and st.user.get("email"):
+            return st.user.get("email")
+    except Exception:
+        pass
+    return st.query_params.get("user") or DEFAULT_USER
@@ -0,0 +1,273 @@
+"""
+코일 슬리팅 최적화 엔진
+
+– 두께 매칭(0.75t/0.8t 호환), 주문 폭 조합 + Filler 채움 패턴 생성
+– 코일별 패턴 선택 MILP (CBC) – 수요: 스트립 개수 또는 중량(kg, 코일 중량 × 폭 비율)
+– 폭 허용오차 묶기: 1–2 mm 차이 주문 폭을 대표 폭 하나로 풀고 결과를 원래 주문에 되돌려 배정
+"""
+
+from collections import Counter, defaultdict
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pulp
+
+from core import milp, timing
+
+
+def match_thk(df, thk_id):
+    if thk_id in (750, 800):
+        return df[df["thk_id"].isin([750, 800])]
+    return df[df["thk_id"] == thk_id]
+
+
+def thk_family(thk_id):
+    """match_thk와 같은 호환 규칙 – 0.8t는 0.75t 계열로 본다"""
+    return 750 if thk_id in (750, 800) else thk_id
+
+
+def best_fill(remain, slots):
+    combs = []
+    for r in range(1, len(slots)+1):
+        for c in combinations(slots, r):
+            s = sum(c)
+            if s <= remain:
+                combs.append((c, remain - s))
+    combs.append(((), remain))
+    return sorted(combs, key=lambda x: x[1])
+
+
+def gen_preview(w, ords, fills, N=5):
+    pats = []
+    L = len(ords)
+    for w0 in ords:
+        if w0 <= w:
+            bf = best_fill(w - w0, fills)
+            total = w0 + sum(bf[0][0])
+            waste = w - total
+            pats.append(([w0] + list(bf[0][0]), waste))
+    for k in range(L, 1, -1):
+        for cmb in combinations(ords, k):
+            t = sum(cmb)
+            if t <= w:
+                bf = best_fill(w - t, fills)
+                for c, _ in bf[:N]:
+                    total = t + sum(c)
+                    waste = w - total
+                    pats.append((list(cmb) + list(c), waste))
+    seen, uni = set(), []
+    for s, l in pats:
+        key = tuple(sorted(s))
+        if key not in seen:
+            seen.add(key)
+            uni.append((s, l))
+    uni.sort(key=lambda x: x[1])
+    return uni[:N * 2]  # 다양한 옵션 확보
+
+
+def build_patterns(grp, wids, fills, N=5):
+    """
+    코일별 패턴 행렬(int32, 패턴 × 주문 폭별 개수), 실제 폐폭 배열(float32), 슬롯 폭 목록(Filler 포함)
+    """
+    all_patterns = {}
+    waste_dict = {}
+    slots_dict = {}
+    col = {w: j for j, w in enumerate(wids)}
+
+    for coil_id, cw in zip(grp["coil_id"], grp["width"].astype(int)):
+        ord_ws = [wid for wid in wids if wid <= cw]
+        raw = gen_preview(cw, ord_ws, fills, N=N)
+        vecs = np.zeros((len(raw), len(wids)), dtype=np.int32)
+        for r, (slots, _) in enumerate(raw):
+            for s in slots:
+                j = col.get(s)
+                if j is not None:
+                    vecs[r, j] += 1
+        all_patterns[coil_id] = vecs
+        waste_dict[coil_id] = np.fromiter((cw - sum(slots) for slots, _ in raw), np.float32, len(raw))
+        slots_dict[coil_id] = [slots for slots, _ in raw]
+    return all_patterns, waste_dict, slots_dict
+
+
+def strip_weights(coil_weight, coil_width, widths):
+    """스트립 중량(kg) = 코일 중량 × 스트립 폭 / 코일 폭 (배열 브로드캐스트)"""
+    coil_weight = np.asarray(coil_weight, dtype=float)
+    coil_width = np.asarray(coil_width, dtype=float)
+    return (coil_weight / coil_width)[..., None] * np.asarray(widths, dtype=float)
+
+
+def pattern_arrays(all_patterns, waste_dict):
+    """
+    코일별 패턴 행렬 → 한 배열로 이어 붙임
+    A: (패턴 수, 주문 폭 수) 스트립 개수(int32), coil_of: 패턴별 코일 위치, waste: 패턴별 폐폭, start: 코일별 첫 패턴 위치
+    """
+    n_pats = np.fromiter((len(p) for p in all_patterns.values()), np.int64, len(all_patterns))
+    A = np.concatenate(list(all_patterns.values()))
+    waste = np.concatenate(list(waste_dict.values())).astype(float)
+    coil_of = np.repeat(np.arange(len(n_pats)), n_pats)
+    start = np.concatenate([[0], np.cumsum(n_pats)])
+    return A, coil_of, waste, start
+
+
+def solve_group(thk, grp, df_o, fillers, time_limit=None, by="count"):
+    """
+    한 두께 그룹 최적화
+    by: "count" – 주문 폭별 스트립 개수(demand) 충족 / "kg" – 주문 폭별 중량(demand_kg) 충족
+    → (status, rows)  status: "ok" | "no_patterns" | "failed"
+    """
+    if by == "kg":
+        # 중량 없는 코일은 톤수에 기여할 수 없으므로 제외
+        grp = grp[pd.to_numeric(grp["weight"], errors="coerce") > 0]
+        demands = df_o.groupby("width")["demand_kg"].sum().to_dict()
+    else:
+        demands = df_o.groupby("width")["demand"].sum().to_dict()
+    wids = sorted(demands)
+    fills = match_thk(fillers, thk)["width"].tolist() if not fillers.empty else []
+    with timing.span("patterns", thk=thk, coils=len(grp)):
+        all_patterns, waste_dict, slots_dict = build_patterns(grp, wids, fills)
+
+    if not all_patterns:
+        return "no_patterns", []
+
+    with timing.span("model_build", thk=thk):
+        # 계수는 배열 연산으로 만들고 pulp 모델은 CSR 행렬에서 한 번에 생성
+        A, coil_of, waste, start = pattern_arrays(all_patterns, waste_dict)
+        coils = list(all_patterns)
+        info = grp.drop_duplicates("coil_id").set_index("coil_id").loc[coils]
+        cw = info["width"].to_numpy(float)
+        kg = pd.to_numeric(info["weight"], errors="coerce").to_numpy(float)
+        kg_per_mm = (kg / cw)[coil_of]
+
+        cost = waste * kg_per_mm if by == "kg" else waste          # kg 모드: 스크랩 중량 최소화
+        M = A * (np.asarray(wids, float) * kg_per_mm[:, None]) if by == "kg" else A
+
+        # 제약 행렬 (CSR): 코일별 패턴 1개 이하 + 주문 폭별 수요
+        n, K = len(coil_of), len(coils)
+        pi, pj = np.nonzero(M)
+        matrix = milp.vstack(milp.csr(coil_of, np.arange(n), np.ones(n), K),
+                             milp.csr(pj, pi, M[pi, pj], len(wids)))
+        model, x = milp.build(f"Cut_{thk}", cost, matrix, ["<="] * K + [">="] * len(wids),
+                              [1] * K + [float(demands[w]) for w in wids])
+
+    timing.note(variables=len(x), constraints=len(model.constraints))
+
+    with timing.span("cbc_solve", thk=thk):
+        status = model.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit))
+    if pulp.LpStatus[status] != "Optimal":
+        return "failed", []
+
+    chosen = np.flatnonzero(np.array([v.value() or 0 for v in x]) > 0.5)
+    strip_kg = (A[chosen] * strip_weights(kg[coil_of[chosen]], cw[coil_of[chosen]], wids)).sum(axis=1)
+    rows = []
+    for i, skg in zip(chosen, strip_kg):
+        k = coil_of[i]
+        coil_id, p_idx = coils[k], i - start[k]
+        pat = A[i]
+        slot_desc = [f"{w}×{pat[j]}" for j, w in enumerate(wids) if pat[j] > 0]
+        rows.append({
+            "thickness": thk / 1000,
+            "coil": coil_id,
+            "pattern": "+".join(slot_desc),
+            "waste": float(round(waste[i], 1)),
+            "slots": slots_dict[coil_id][p_idx],
+            "coil_kg": None if np.isnan(kg[k]) else float(round(kg[k], 1)),
+            "order_kg": None if np.isnan(skg) else float(round(skg, 1)),
+        })
+    return "ok", rows
+
+
+def solve_all(orders, stock, fillers, time_limit=None, tol=0, by="count"):
+    """
+    재고 두께 그룹별 solve_group → (결과 행, {thk_id: status})
+    tol > 0 이면 폭 묶기 후 풀고 행마다 원래 주문 폭 배정("orders")을 붙인다.
+    """
+    if tol:
+        orders, _ = cluster_orders(orders, tol)
+    results_all, statuses = [], {}
+    for thk, grp in stock.groupby("thk_id"):
+        df_o = match_thk(orders, thk)
+        if df_o.empty:
+            continue
+        statuses[thk], rows = solve_group(thk, grp, df_o, fillers, time_limit, by)
+        results_all.extend(rows)
+    if tol:
+        assign_orders(results_all, orders, by)
+    return results_all, statuses
+
+
+def plan_table(rows):
+    """결과 행 → 계획 표 (cutting_plan.csv 열, 슬롯은 "437+437+120" 문자열)"""
+    df = pd.DataFrame(rows)
+    if "slots" in df:
+        df["slots"] = df["slots"].map(lambda s: "+".join(f"{w:g}" for w in s))
+    return df
+
+
+# -------------------------------------------------------------------
+# 폭 허용오차 묶기
+# -------------------------------------------------------------------
+def cluster_widths(widths, tol):
+    """
+    정렬된 폭을 앞에서부터 묶음 (묶음 첫 폭 + tol 이내) → {원래 폭: 대표 폭}
+    대표 폭 = 묶음의 최대 폭 (넓은 스트립이 묶음 안 모든 주문을 만족)
+    """
+    mapping, group = {}, []
+    for w in sorted(set(widths)):
+        if group and w - group[0] > tol:
+            mapping.update(dict.fromkeys(group, group[-1]))
+            group = []
+        group.append(w)
+    mapping.update(dict.fromkeys(group, group[-1]))
+    return mapping
+
+
+def cluster_orders(orders, tol):
+    """
+    두께 계열별 폭 묶기 → (대표 폭 주문 프레임, 축소 보고)
+    반환 프레임의 width는 대표 폭, order_width는 원래 주문 폭
+    """
+    fam = orders["thk_id"].map(thk_family)
+    rep = orders["width"].copy()
+    merged = []
+    for f, idx in orders.groupby(fam).groups.items():
+        mapping = cluster_widths(orders.loc[idx, "width"], tol)
+        rep.loc[idx] = orders.loc[idx, "width"].map(mapping)
+        groups = defaultdict(list)
+        for w, r in mapping.items():
+            groups[r].append(w)
+        merged += [(f / 1000, ws, r) for r, ws in groups.items() if len(ws) > 1]
+
+    out = orders.assign(order_width=orders["width"], width=rep)
+    report = {
+        "widths_before": int(orders.assign(f=fam).drop_duplicates(["f", "width"]).shape[0]),
+        "widths_after": int(out.assign(f=fam).drop_duplicates(["f", "width"]).shape[0]),
+        "merged": merged,
+    }
+    return out, report
+
+
+def assign_orders(rows, orders, by="count"):
+    """
+    대표 폭 스트립을 원래 주문 폭에 배정 (남은 수요가 큰 주문부터)
+    rows에 "orders" 열("437×1+438×2")을 추가. 수요를 넘는 스트립은 배정하지 않는다.
+    by="kg"이면 남은 수요를 중량으로 보고 스트립 중량만큼 차감
+    """
+    pending = defaultdict(Counter)
+    demand = orders["demand_kg"] if by == "kg" else orders["demand"]
+    for f, w, ow, d in zip(orders["thk_id"].map(thk_family), orders["width"], orders["order_width"], demand):
+        pending[(f, w)][ow] += d
+    for r in rows:
+        got = Counter()
+        fam = thk_family(round(r["thickness"] * 1000))
+        per_mm = (r["coil_kg"] or 0) / (sum(r["slots"]) + r["waste"]) if by == "kg" else None
+        for w in r["slots"]:
+            left = pending.get((fam, w))
+            if left:
+                ow, _ = left.most_common(1)[0]
+                got[ow] += 1
+                left[ow] -= w * per_mm if by == "kg" else 1
+                if left[ow] <= 0:
+                    del left[ow]
+        r["orders"] = "+".join(f"{w:g}×{n}" for w, n in sorted(got.items()))
+    return rows
@@ -0,0 +1,148 @@
+"""
+시나리오 비교 (원자재 길이 · 척 길이 · 코일 구성 · Filler 조합)
+
+– 변형마다 최적화를 돌려 사용량 · 폐기량 · 세팅(서로 다른 패턴) 수를 한 표로
+– 공유 계산: 파이프는 유효 길이(원자재 - 척)가 같은 변형끼리 최적화 1회,
+  조각 정렬은 한 번만. 결과는 입력 해시 기준으로 프로세스 안에 캐시
+– 새로 풀어야 하는 변형은 프로세스 풀에서 병렬 실행
+– pareto: 모든 지표에서 다른 변형보다 나쁘지 않은(지배되지 않는) 변형 표시
+"""
+
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.pipe import pat_key, reduce_patterns, solve
+from core.slitting import cluster_orders, solve_all
+from core.verify import verify_slitting
+
+_cache = {}   # (종류, 입력 해시, 변형 키) → 지표 dict
+CACHE_SIZE = 512
+
+
+def _store(key, value):
+    if len(_cache) >= CACHE_SIZE:
+        _cache.pop(next(iter(_cache)))   # 가장 먼저 넣은 항목부터
+    _cache[key] = value
+
+
+def _run_parallel(fn, tasks, workers):
+    """tasks: [args tuple, ...] → 결과 목록 (작업이 1개 이하면 현재 프로세스에서)"""
+    if len(tasks) < 2 or workers < 2:
+        return [fn(*t) for t in tasks]
+    with ProcessPoolExecutor(min(workers, len(tasks))) as ex:
+        return list(ex.map(fn, *zip(*tasks)))
+
+
+def pareto(df, cols):
+    """cols 모두 작을수록 좋다고 보고 지배되지 않는 행 → bool Series"""
+    v = df[cols].to_numpy(float)
+    if not len(v):
+        return pd.Series([], dtype=bool, index=df.index)
+    le = (v[:, None, :] <= v[None, :, :]).all(axis=2)   # [i, j]: i가 j보다 모든 지표에서 나쁘지 않음
+    lt = (v[:, None, :] < v[None, :, :]).any(axis=2)
+    dominated = (le & lt).any(axis=0)
+    return pd.Series(~dominated, index=df.index)
+
+
+# -------------------------------------------------------------------
+# 1) 파이프 – 원자재 길이 × 척 길이
+# -------------------------------------------------------------------
+def _pipe_eff(pieces, eff_len, time_limit, reduce_setups):
+    """유효 길이 1개 → 막대 배치 지표 (원자재 · 척 길이와 무관한 부분)"""
+    sol = solve(pieces, eff_len, time_limit=time_limit)
+    bars = reduce_patterns(sol["bars"], eff_len) if reduce_setups else sol["bars"]
+    return {"bars": len(bars), "setups": len(Counter(pat_key(b) for b in bars)),
+            "lower_bound": sol["lower_bound"]}
+
+
+def pipe_sweep(pieces, stock_lens, chuck_lens, time_limit=2.0, reduce_setups=False, workers=None):
+    """
+    pieces: 조각 길이 목록, stock_lens × chuck_lens 모든 조합
+    → 변형별 표 (stock_len, chuck_len, bars, stock_m, waste_mm, yield_pct, setups, pareto)
+    pareto 기준: 막대 수 · 폐기량 · 세팅 수
+    """
+    pieces = sorted((int(p) for p in pieces), reverse=True)
+    total = sum(pieces)
+    key = hashlib.sha1(np.asarray(pieces, np.int64).tobytes()).hexdigest()
+    combos = [(int(s), int(c)) for s in stock_lens for c in chuck_lens]
+    effs = sorted({s - c for s, c in combos if pieces and s - c >= pieces[0]})
+
+    done = {e: _cache[k] for e in effs if (k := ("pipe", key, e, time_limit, reduce_setups)) in _cache}
+    todo = [e for e in effs if e not in done]
+    for e, res in zip(todo, _run_parallel(_pipe_eff, [(pieces, e, time_limit, reduce_setups) for e in todo],
+                                          workers or os.cpu_count() or 1)):
+        _store(("pipe", key, e, time_limit, reduce_setups), res)
+        done[e] = res
+
+    rows = []
+    for s, c in combos:
+        row = {"stock_len": s, "chuck_len": c, "eff_len": s - c}
+        res = done.get(s - c)
+        if res is None:
+            rows.append({**row, "error": f"piece {pieces[0] if pieces else 0} mm > effective length"})
+            continue
+        stock_mm = res["bars"] * s
+        rows.append({**row, "bars": res["bars"], "stock_m": round(stock_mm / 1000, 1),
+                     "waste_mm": stock_mm - total, "yield_pct": round(total / stock_mm * 100, 2),
+                     "setups": res["setups"], "lower_bound": res["lower_bound"]})
+    df = pd.DataFrame(rows)
+    if "error" in df:
+        df = df[[c for c in df if c != "error"] + ["error"]]
+    return _finish(df, ["bars", "waste_mm", "setups"])
+
+
+# -------------------------------------------------------------------
+# 2) 슬리팅 – 코일 구성 × Filler 조합
+# -------------------------------------------------------------------
+def _frame_key(*dfs):
+    h = hashlib.sha1()
+    for df in dfs:
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes() if len(df) else b"-")
+    return h.hexdigest()
+
+
+def _slitting_one(orders, stock, fillers, time_limit, tol, by):
+    rows, statuses = solve_all(orders, stock, fillers, time_limit, tol, by)
+    chk = verify_slitting(rows, cluster_orders(orders, tol)[0] if tol else orders, stock, by)
+    return {"coils": len(rows), "waste_mm": chk["waste_mm"], "yield_pct": chk["yield_pct"],
+            "setups": len({(r["thickness"], r["pattern"]) for r in rows}), "verified": chk["ok"],
+            "failed_thk": ",".join(f"{t / 1000:g}" for t, s in statuses.items() if s != "ok")}
+
+
+def slitting_sweep(orders, scenarios, time_limit=None, tol=0, by="count", workers=None):
+    """
+    scenarios: [(코일 구성 이름, stock DataFrame, Filler 조합 이름, fillers DataFrame), ...]
+    → 변형별 표 (stock, fillers, coils, waste_mm, yield_pct, setups, verified, pareto)
+    수요를 채우지 못한 변형(verified=False)은 pareto 후보에서 뺀다.
+    """
+    okey = _frame_key(orders)
+    keys = [("slitting", okey, _frame_key(st, fl), time_limit, tol, by) for _, st, _, fl in scenarios]
+    done = {k: _cache[k] for k in keys if k in _cache}
+    todo = {k: (orders, st, fl, time_limit, tol, by)
+            for k, (_, st, _, fl) in zip(keys, scenarios) if k not in done}
+    for k, res in zip(todo, _run_parallel(_slitting_one, list(todo.values()), workers or os.cpu_count() or 1)):
+        _store(k, res)
+        done[k] = res
+
+    df = pd.DataFrame([{"stock": s_name, "fillers": f_name, "lots": len(st), **done[k]}
+                       for k, (s_name, st, f_name, _) in zip(keys, scenarios)])
+    return _finish(df, ["coils", "waste_mm", "setups"], df["verified"] if len(df) else None)
+
+
+def _finish(df, cols, eligible=None):
+    """pareto 열 추가 → pareto 우선, 첫 지표 오름차순"""
+    if df.empty:
+        return df
+    ok = df[cols[0]].notna() if cols[0] in df else pd.Series(False, index=df.index)
+    if eligible is not None:
+        ok &= eligible.astype(bool)
+    df["pareto"] = False
+    if ok.any():
+        df.loc[ok, "pareto"] = pareto(df[ok], cols)
+    sort = ["pareto"] + [c for c in cols if c in df]
+    return df.sort_values(sort, ascending=[False] + [True] * (len(sort) - 1), kind="stable").reset_index(drop=True)
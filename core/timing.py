@@ -0,0 +1,141 @@
+"""
+단계별 시간 측정 · 실행 로그 · cProfile
+
+    tr = timing.start("pipe_cutter", pieces=len(pieces))
+    with timing.span("ffd"):
+        ...
+    timing.note(variables=120, constraints=40)
+    timing.finish(tr)        # logs/runs.jsonl 기록 + 사이드바 표시
+
+– 진행 중 실행은 ContextVar에 보관 (Streamlit 세션 스레드별로 분리)
+– span/note는 진행 중인 실행이 없으면 아무 것도 하지 않으므로 core 알고리즘 안에서도 사용
+– start(..., profile=True) 이면 해당 실행 전체를 cProfile로 수집
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+LOG_DIR = "logs"
+LOG_FILE = os.path.join(LOG_DIR, "runs.jsonl")
+
+_current = ContextVar("timing_run", default=None)
+
+
+class Run:
+    def __init__(self, page, profile=False, **inputs):
+        self.page = page
+        self.inputs = inputs
+        self.stages = []
+        self.model = {}
+        self.t0 = time.perf_counter()
+        self.total_ms = None
+        self.profile_text = None
+        self.profile_path = None
+        self._prof = cProfile.Profile() if profile else None
+
+    def record(self):
+        return {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "page": self.page,
+            "input": self.inputs,
+            "stages": self.stages,
+            "model": self.model,
+            "total_ms": self.total_ms,
+            "profile": self.profile_path,
+        }
+
+
+def start(page, profile=False, **inputs):
+    run = Run(page, profile, **inputs)
+    _current.set(run)
+    if run._prof:
+        run._prof.enable()
+    return run
+
+
+@contextmanager
+def span(name, **meta):
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.stages.append({"name": name, "ms": round((time.perf_counter() - t0) * 1000, 2), **meta})
+
+
+def note(**model):
+    """모델 크기(변수·제약 수 등) 누적 기록"""
+    run = _current.get()
+    if run is None:
+        return
+    for k, v in model.items():
+        run.model[k] = run.model.get(k, 0) + v if isinstance(v, (int, float)) else v
+
+
+def finish(run, log_file=LOG_FILE, show=True):
+    if run._prof:
+        run._prof.disable()
+        os.makedirs(LOG_DIR, exist_ok=True)
+        run.profile_path = os.path.join(LOG_DIR, f"profile_{run.page}_{datetime.now():%Y%m%d_%H%M%S}.prof")
+        run._prof.dump_stats(run.profile_path)
+        buf = io.StringIO()
+        pstats.Stats(run._prof, stream=buf).sort_stats("cumulative").print_stats(25)
+        run.profile_text = buf.getvalue()
+        run._prof = None
+    run.total_ms = round((time.perf_counter() - run.t0) * 1000, 2)
+    _current.set(None)
+
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run.record(), ensure_ascii=False, default=str) + "\n")
+    if show:
+        sidebar(run)
+    return run
+
+
+# -------------------------------------------------------------------
+# Streamlit 표시
+# -------------------------------------------------------------------
+def sidebar(run):
+    """사이드바에 단계별 시간 표 (접이식)"""
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander(f"⏱ Timing – {run.total_ms:,.0f} ms"):
+        if run.stages:
+            df = pd.DataFrame(run.stages)
+            agg = df.groupby("name", sort=False)["ms"].agg(["sum", "count"]).reset_index()
+            agg.columns = ["stage", "ms", "calls"]
+            st.dataframe(agg, hide_index=True)
+        if run.model:
+            st.json(run.model)
+        if run.profile_text:
+            st.caption(f"cProfile → {run.profile_path}")
+            st.code(run.profile_text, language="text")
+
+
+def profile_button(key):
+    """사이드바 버튼 – 다음 실행 1회 cProfile 예약"""
+    import streamlit as st
+
+    if st.sidebar.button("🔬 Profile next run", key=f"profile_btn_{key}"):
+        st.session_state[f"profile_next_{key}"] = True
+    if st.session_state.get(f"profile_next_{key}"):
+        st.sidebar.caption("cProfile armed for the next run")
+
+
+def take_profile(key):
+    """예약된 cProfile 요청을 소비 → 이번 실행에서 프로파일링 여부"""
+    import streamlit as st
+
+    return bool(st.session_state.pop(f"profile_next_{key}", False))
@@ -0,0 +1,158 @@
+"""
+절단 · 슬리팅 계획 검증
+
+– 계획 전체를 평탄화(flatten)한 NumPy 배열 한 번으로 검사
+– 파이프: 조각 수요와 정확히 일치, 막대 용량 초과 없음, remain 값 일치, 수율·폐기 재계산
+– 슬리팅: 코일 존재·중복 사용, 두께 일치(0.75t/0.8t 호환), 코일 폭 초과 없음,
+          주문 폭별 수요(개수 또는 kg) 충족, 수율·폐기 재계산
+→ {"ok", "errors", ...지표}  errors는 앞에서부터 MAX_ERRORS개만 문장으로 남긴다
+"""
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+MAX_ERRORS = 20
+THK_COMPAT = {800: 750}   # match_thk와 같은 호환 규칙 (0.8t → 0.75t 계열)
+
+
+def _count_diff(produced, demanded):
+    """두 정수 배열의 값별 개수 차이 → (값, 생산 - 수요) 중 0이 아닌 것"""
+    vals, inv = np.unique(np.concatenate([produced, demanded]), return_inverse=True)
+    sign = np.concatenate([np.ones(len(produced)), -np.ones(len(demanded))])
+    diff = np.bincount(inv, weights=sign, minlength=len(vals)).astype(np.int64)
+    nz = diff != 0
+    return vals[nz], diff[nz]
+
+
+def _report(errors, **metrics):
+    return {"ok": not errors, "errors": errors[:MAX_ERRORS], "n_errors": len(errors), **metrics}
+
+
+# -------------------------------------------------------------------
+# 1) 파이프 절단
+# -------------------------------------------------------------------
+def verify_pipe(bars, pieces, eff_len, chuck_len=0):
+    """
+    bars: core.pipe.Bar 목록 (cuts, remain, 잔재 막대는 length), pieces: 계획 전 조각 길이 목록
+    막대 원장 길이 = eff_len + chuck_len (잔재 막대는 length)
+    """
+    n = len(bars)
+    counts = np.fromiter((len(b.cuts) for b in bars), np.int64, n)
+    cuts = np.fromiter(chain.from_iterable(b.cuts for b in bars), np.int64, int(counts.sum()))
+    stock = np.fromiter((eff_len + chuck_len if b.length is None else b.length for b in bars), np.int64, n)
+    remain = np.fromiter((b.remain for b in bars), np.int64, n)
+    cap = stock - chuck_len
+    used = np.bincount(np.repeat(np.arange(n), counts), weights=cuts, minlength=n).astype(np.int64)
+
+    errors = []
+    for i in np.flatnonzero(counts == 0):
+        errors.append(f"bar {i + 1}: no cuts")
+    for i in np.flatnonzero(cuts <= 0):
+        errors.append(f"cut #{i + 1}: invalid length {cuts[i]}")
+    for i in np.flatnonzero(used > cap):
+        errors.append(f"bar {i + 1}: cuts {used[i]} mm > capacity {cap[i]} mm")
+    for i in np.flatnonzero(cap - used != remain):
+        errors.append(f"bar {i + 1}: remain {remain[i]} mm, recomputed {cap[i] - used[i]} mm")
+    for v, d in zip(*_count_diff(cuts, np.asarray(pieces, dtype=np.int64))):
+        errors.append(f"{v} mm: {'extra' if d > 0 else 'missing'} {abs(d)} pcs")
+
+    total = int(stock.sum())
+    waste = total - int(used.sum())
+    return _report(errors, bars=n, stock_mm=total, waste_mm=waste,
+                   yield_pct=round(float(used.sum()) / total * 100, 2) if total else 0.0)
+
+
+# -------------------------------------------------------------------
+# 2) 코일 슬리팅
+# -------------------------------------------------------------------
+def _thk_family(thk_id):
+    thk_id = np.asarray(thk_id, dtype=np.int64)
+    out = thk_id.copy()
+    for k, v in THK_COMPAT.items():
+        out[thk_id == k] = v
+    return out
+
+
+def verify_slitting(rows, orders, stock, by="count"):
+    """
+    rows: solve_group 결과 행 (coil, thickness, slots, waste)
+    orders: thk_id, width, demand(, demand_kg) / stock: coil_id, thk_id, width(, weight)
+    주문 폭과 같은 폭의 슬롯은 채움(Filler) 여부와 관계없이 주문 생산량으로 센다 (패턴 벡터와 동일).
+    by="kg"이면 수요 충족을 스트립 중량(코일 중량 × 폭 비율)으로 검사
+    """
+    errors = []
+    n = len(rows)
+    coil_ids = [r["coil"] for r in rows]
+    counts = np.fromiter((len(r["slots"]) for r in rows), np.int64, n)
+    slots = np.rint(np.fromiter(chain.from_iterable(r["slots"] for r in rows), float, int(counts.sum())))
+    slots = slots.astype(np.int64)
+    thk = np.fromiter((round(r["thickness"] * 1000) for r in rows), np.int64, n)
+    waste = np.fromiter((r["waste"] for r in rows), float, n)
+
+    # 코일 조회 – 재고에 없는 코일 / 한 코일 중복 사용
+    lookup = {c: i for i, c in reversed(list(enumerate(stock["coil_id"].astype(str))))}
+    at = np.fromiter((lookup.get(str(c), -1) for c in coil_ids), np.int64, n)
+    for i in np.flatnonzero(at < 0):
+        errors.append(f"{coil_ids[i]}: not in stock")
+    uniq, first, times = np.unique(at, return_index=True, return_counts=True)
+    for k in np.flatnonzero((times > 1) & (uniq >= 0)):
+        errors.append(f"{coil_ids[first[k]]}: used {times[k]} times")
+
+    ok = at >= 0
+    coil_w = np.zeros(n, np.int64)
+    coil_thk = np.zeros(n, np.int64)
+    coil_w[ok] = np.rint(stock["width"].to_numpy(float)).astype(np.int64)[at[ok]]
+    coil_thk[ok] = stock["thk_id"].to_numpy(np.int64)[at[ok]]
+
+    # 폭 · 두께
+    used = np.bincount(np.repeat(np.arange(n), counts), weights=slots, minlength=n).astype(np.int64)
+    for i in np.flatnonzero(ok & (used > coil_w)):
+        errors.append(f"{coil_ids[i]}: slots {used[i]} mm > width {coil_w[i]} mm")
+    for i in np.flatnonzero(ok & (np.abs((coil_w - used) - waste) > 0.5)):
+        errors.append(f"{coil_ids[i]}: waste {waste[i]:g} mm, recomputed {coil_w[i] - used[i]} mm")
+    for i in np.flatnonzero(ok & (_thk_family(coil_thk) != _thk_family(thk))):
+        errors.append(f"{coil_ids[i]}: thickness {thk[i] / 1000}t ≠ coil {coil_thk[i] / 1000}t")
+
+    if by == "kg":
+        kg_per_mm = np.zeros(n)
+        kg_per_mm[ok] = (pd.to_numeric(stock["weight"], errors="coerce").to_numpy(float)[at[ok]]
+                         / np.maximum(coil_w[ok], 1))
+        return _verify_kg(errors, rows, orders, thk, counts, slots, kg_per_mm, coil_w, used, ok)
+
+    # 수요 충족 – (두께 계열, 폭) 키로 생산 수 - 수요 수
+    slot_key = np.repeat(_thk_family(thk), counts) * 100_000 + slots
+    dem_key = (_thk_family(orders["thk_id"].to_numpy(np.int64)) * 100_000
+               + np.rint(orders["width"].to_numpy(float)).astype(np.int64))
+    dem_key = np.repeat(dem_key, orders["demand"].to_numpy().astype(np.int64))
+    keys, diff = _count_diff(slot_key[np.isin(slot_key, dem_key)], dem_key)
+    for k, d in zip(keys[diff < 0], diff[diff < 0]):
+        errors.append(f"{k // 100_000 / 1000}t × {k % 100_000} mm: short {-d}")
+
+    total = int(coil_w.sum())
+    return _report(errors, coils=n, stock_mm=total, waste_mm=total - int(used[ok].sum()),
+                   surplus=int(diff[diff > 0].sum()),
+                   yield_pct=round(float(used[ok].sum()) / total * 100, 2) if total else 0.0)
+
+
+def _verify_kg(errors, rows, orders, thk, counts, slots, kg_per_mm, coil_w, used, ok):
+    """중량 수요 – (두께 계열, 폭) 키별 스트립 중량 합 vs demand_kg"""
+    slot_key = np.repeat(_thk_family(thk), counts) * 100_000 + slots
+    slot_kg = np.repeat(kg_per_mm, counts) * slots
+    dem_key = (_thk_family(orders["thk_id"].to_numpy(np.int64)) * 100_000
+               + np.rint(orders["width"].to_numpy(float)).astype(np.int64))
+    dem_kg = pd.to_numeric(orders["demand_kg"], errors="coerce").fillna(0).to_numpy(float)
+    keys, inv = np.unique(np.concatenate([slot_key, dem_key]), return_inverse=True)
+    made = np.bincount(inv[:len(slot_key)], weights=slot_kg, minlength=len(keys))
+    need = np.bincount(inv[len(slot_key):], weights=dem_kg, minlength=len(keys))
+    short = need - made
+    for k in np.flatnonzero((need > 0) & (short > 0.5)):
+        errors.append(f"{keys[k] // 100_000 / 1000}t × {keys[k] % 100_000} mm: short {short[k]:,.1f} kg")
+
+    total = int(coil_w.sum())
+    ordered = need > 0
+    return _report(errors, coils=len(rows), stock_mm=total, waste_mm=total - int(used[ok].sum()),
+                   order_kg=round(float(made[ordered].sum()), 1), demand_kg=round(float(need.sum()), 1),
+                   surplus_kg=round(float(np.clip(made - need, 0, None)[ordered].sum()), 1),
+                   yield_pct=round(float(used[ok].sum()) / total * 100, 2) if total else 0.0)
@@ -2,26 +2,35 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 from collections import Counter
-import json, os, uuid
+import uuid
+
+from core.pipe import (expand_pieces, new_remnants, pack_remnants, pat_key, pattern_table, plan_cost,
+                       reduce_patterns, solve)
+from core.bulk_import import import_once
+from core.chart import pattern_figure
+from core.parsers import parse_cut_list
+from core.remnants import RemnantStore
+from core.settings import SettingsStore, current_user
+from core.verify import verify_pipe
+from core import timing
 
 # ─────────────────────────────────────────────
 # 0. 파라미터 저장/불러오기
 # ─────────────────────────────────────────────
 SETTING_FILE = "pipe_cutter_settings.json"
+settings = SettingsStore(SETTING_FILE, {"stock_len": 6000, "chuck_len": 300})
+user = current_user()
+cfg = settings.get(user)
 
-def load_settings():
-    if os.path.exists(SETTING_FILE):
-        with open(SETTING_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"stock_len": 6000, "chuck_len": 300}
+st.set_page_config(page_title="Pipe Cutter Optimizer", layout="wide")
 
-def save_settings(cfg):
-    with open(SETTING_FILE, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, ensure_ascii=False, indent=2)
 
-cfg = load_settings()
+@st.cache_resource
+def remnant_store():
+    """잔재 DB 연결은 프로세스당 하나 (rerun마다 새로 열지 않음)"""
+    return RemnantStore()
+
 
-st.set_page_config(page_title="Pipe Cutter Optimizer", layout="wide")
 st.title("Pipe Cutting Optimization (First‑Fit‑Decreasing)")
 
 # ─────────────────────────────────────────────
@@ -33,9 +42,29 @@ with st.sidebar:
     chuck_len = st.number_input("Chuck Length (mm)", min_value=0, value=int(cfg["chuck_len"]), step=10)
     st.markdown(f"**Effective Length** = {stock_len - chuck_len} mm")
 
-if (stock_len != cfg["stock_len"]) or (chuck_len != cfg["chuck_len"]):
-    cfg["stock_len"], cfg["chuck_len"] = stock_len, chuck_len
-    save_settings(cfg)
+    st.header("Remnant Stock")
+    store = remnant_store()
+    pipe_spec = st.text_input("Pipe Spec (remnant group)", value="").strip()
+    use_remnants = st.checkbox("Use remnants first", value=False)
+    update_remnants = st.checkbox("Update remnant inventory after run", value=False)
+    min_remnant = st.number_input("Keep Remnants ≥ (mm)", min_value=0, value=1000, step=100)
+    with st.expander("Remnant Inventory"):
+        inv = store.summary(pipe_spec)
+        if inv:
+            st.dataframe(pd.DataFrame(inv, columns=["Length(mm)", "Qty"]), hide_index=True)
+        else:
+            st.caption("No remnants stored.")
+
+    st.header("Setup Optimization")
+    reduce_setups = st.checkbox("Minimize saw setups", value=False)
+    max_extra = st.number_input("Max Extra Bars", min_value=0, value=0, step=1)
+    setup_min = st.number_input("Setup Time (min)", min_value=0.0, value=10.0, step=1.0)
+    cycle_min = st.number_input("Cycle Time per Bar (min)", min_value=0.0, value=1.0, step=0.5)
+    shift_min = st.number_input("Shift Length (min)", min_value=1, value=480, step=30)
+
+timing.profile_button("pipe")
+
+settings.update({"stock_len": stock_len, "chuck_len": chuck_len}, user)
 
 # ─────────────────────────────────────────────
 # 2. 절단 리스트 입력 – 입력 에디터
@@ -53,31 +82,36 @@ with left:
 
 tbl_key = st.session_state.get("tbl_key", "cut_editor")
 
-editor_df = st.session_state.cut_df.reset_index(drop=True)
-editor_df.index.name = None
-edited_df = st.data_editor(
-    editor_df,
-    hide_index=True,
-    num_rows="dynamic",
-    column_config={
-        "Length(mm)": st.column_config.NumberColumn(format="%d"),
-        "Qty":        st.column_config.NumberColumn(format="%d"),
-    },
-    key=tbl_key,
-    use_container_width=True,
-)
+upload = st.file_uploader("Upload Cutting List (XLSX/CSV: Length(mm), Qty)", type=["xlsx", "csv"])
+imported = import_once(st.session_state, "cut_import", upload, parse_cut_list)
+
+if imported is None:
+    editor_df = st.session_state.cut_df.reset_index(drop=True)
+    editor_df.index.name = None
+    edited_df = st.data_editor(
+        editor_df,
+        hide_index=True,
+        num_rows="dynamic",
+        column_config={
+            "Length(mm)": st.column_config.NumberColumn(format="%d"),
+            "Qty":        st.column_config.NumberColumn(format="%d"),
+        },
+        key=tbl_key,
+        use_container_width=True,
+    )
+else:
+    st.success(f"{len(imported):,} rows imported ({int(imported['Qty'].sum()):,} pieces)")
+    st.dataframe(imported.head(20), hide_index=True)
 
 # ─────────────────────────────────────────────
 # 3. 계산 실행
 # ─────────────────────────────────────────────
 if st.button("Run Optimization", use_container_width=True):
-    st.session_state.cut_df = edited_df.copy()
-
-    df = st.session_state.cut_df.copy()
-    df["Length(mm)"] = pd.to_numeric(df["Length(mm)"], errors="coerce")
-    df["Qty"]        = pd.to_numeric(df["Qty"],        errors="coerce")
-    df = df.dropna().astype(int)
-    df = df[df["Qty"] > 0]
+    if imported is None:
+        st.session_state.cut_df = edited_df.copy()
+        df = parse_cut_list(st.session_state.cut_df)
+    else:
+        df = imported
 
     if df.empty:
         st.warning("Please enter valid lengths and quantities.")
@@ -86,84 +120,96 @@ if st.button("Run Optimization", use_container_width=True):
         st.error("Chuck length cannot be equal to or greater than stock length.")
         st.stop()
 
-    # ── FFD 알고리즘
-    pieces = [l for l, q in zip(df["Length(mm)"], df["Qty"]) for _ in range(q)]
-    pieces.sort(reverse=True)
+    # ── FFD 알고리즘 + 하한 비교 (하한 도달 시 개선 단계 생략)
+    pieces = expand_pieces(df["Length(mm)"], df["Qty"])
     eff_len = stock_len - chuck_len
-    bars = []
-    for p in pieces:
-        for bar in bars:
-            if bar["remain"] >= p:
-                bar["cuts"].append(p)
-                bar["remain"] -= p
-                break
-        else:
-            bars.append({"cuts": [p], "remain": eff_len - p})
+    tr = timing.start("pipe_cutter", profile=timing.take_profile("pipe"),
+                      lines=len(df), pieces=len(pieces), stock_len=stock_len, chuck_len=chuck_len)
 
-    # ── 패턴 묶기
-    def pat_key(bar): return tuple(sorted(bar["cuts"], reverse=True))
+    # ── 잔재 우선 배치 (길이 범위 조회 → Best-Fit-Decreasing)
+    demand = pieces
+    remnant_bars = []
+    if use_remnants:
+        with timing.span("remnants"):
+            stock_rem = store.available(pipe_spec, min_len=pieces[-1] + chuck_len)
+            remnant_bars, pieces = pack_remnants(pieces, stock_rem, chuck_len)
+
+    sol = solve(pieces, eff_len)
+    bars = sol["bars"]
+
+    # ── 패턴 묶기 (+ 세팅 최소화)
     pattern_dict = Counter(pat_key(b) for b in bars)
+    if reduce_setups and bars:
+        before = pattern_dict
+        with timing.span("pattern_reduction"):
+            bars = reduce_patterns(bars, eff_len, max_extra, setup_min, cycle_min)
+        pattern_dict = Counter(pat_key(b) for b in bars)
+        t_before = plan_cost(before, setup_min, cycle_min)
+        t_after = plan_cost(pattern_dict, setup_min, cycle_min)
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Setups", len(pattern_dict), len(pattern_dict) - len(before), delta_color="inverse")
+        c2.metric("Bars", len(bars), len(bars) - sum(before.values()), delta_color="inverse")
+        c3.metric("Shop Time (min)", f"{t_after:.0f}", f"{t_after - t_before:.0f}", delta_color="inverse")
+        st.caption(f"≈ {t_after / shift_min:.2f} shifts | "
+                   f"{len(pattern_dict) / max(t_after / shift_min, 1e-9):.1f} setups per shift")
 
     # ── 시각화
     st.subheader("Cutting Pattern Chart (by Pattern)")
-    fig_height = 1 + 0.8 * len(pattern_dict)
-    fig, ax = plt.subplots(figsize=(12, fig_height))
-
-    ax.set_xlim(0, stock_len)
-    ax.set_xlabel("mm")
-    ax.invert_yaxis()
-    ax.set_yticks([])
-    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
-
-    for idx, (pat, qty) in enumerate(pattern_dict.items()):
-        cuts = list(pat)
-        y = idx + 0.4
-        cursor = 0
-        color = colors[idx % len(colors)]
-        for cut in cuts:
-            ax.barh(y, cut, left=cursor, height=0.6, color=color)
-            ax.text(cursor + cut / 2, y, str(cut), va="center", ha="center", color="white", fontsize=8)
-            cursor += cut
-
-        remain = eff_len - sum(cuts)
-        if remain > 0:
-            ax.barh(y, remain, left=cursor, height=0.6, color="dimgray")
-            ax.text(cursor + remain / 2, y, str(remain), va="center", ha="center", color="white", fontsize=8)
-
-        ax.barh(y, chuck_len, left=stock_len - chuck_len, height=0.6, color="lightgray")
-        ax.text(-200, y, f"Pattern {idx + 1} × {qty}", va="center", ha="right", fontsize=10)
-
-    ax.set_title("Cutting Pattern Summary (Quantities by Pattern)", fontsize=14)
-    ax.axis("off")
-
-    # ▶ 총 막대 수량 표시
-    total_bars = sum(pattern_dict.values())
-    ax.text(stock_len / 2, len(pattern_dict) + 0.8, f"TOTAL: {total_bars} bars",
-            ha="center", va="center", fontsize=14, fontweight="bold", color="black")
-
-    st.pyplot(fig)
+    with timing.span("chart", patterns=len(pattern_dict)):
+        fig = pattern_figure(pattern_dict, stock_len, chuck_len)
+        st.pyplot(fig)
+        plt.close(fig)
 
     # ── 결과 테이블
-    rows = []
-    for i, (pat, qty) in enumerate(pattern_dict.items(), 1):
-        used = sum(pat)
-        remain = eff_len - used
-        rows.append({
-            "#": i,
-            "Quantity": qty,
-            "Cuts": ", ".join(map(str, pat)),
-            "Used(mm)": used,
-            "Remain(mm)": remain,
-            "Waste(mm)": remain + chuck_len
-        })
-    result_df = pd.DataFrame(rows)
+    result_df = pattern_table(pattern_dict, eff_len, chuck_len)
 
     st.subheader("Pattern Summary Table")
     st.dataframe(result_df, use_container_width=True)
 
-    total_waste = sum(b["remain"] for b in bars) + chuck_len * len(bars)
-    st.info(f"Total Bars: {len(bars)} | Total Waste: {total_waste} mm")
+    all_bars = bars + remnant_bars
+    total_waste = sum(b.remain for b in all_bars) + chuck_len * len(all_bars)
+    used = f" (new {len(bars)} + remnants {len(remnant_bars)})" if remnant_bars else ""
+    st.info(f"Total Bars: {len(all_bars)}{used} | Total Waste: {total_waste} mm")
+
+    # ▶ 계획 검증 (조각 수요 일치 · 막대 용량 · 잔여 길이 재계산)
+    with timing.span("verify"):
+        chk = verify_pipe(bars + remnant_bars, demand, eff_len, chuck_len)
+    if chk["ok"]:
+        st.caption(f"✔ Plan verified | Yield {chk['yield_pct']}% | "
+                   f"Waste {chk['waste_mm']:,} mm of {chk['stock_mm']:,} mm")
+    else:
+        st.error(f"Plan verification failed ({chk['n_errors']} issues)\n\n"
+                 + "\n".join(f"- {e}" for e in chk["errors"]))
+
+    # ▶ 잔재 사용 내역
+    if remnant_bars:
+        st.subheader("Remnants Used")
+        st.dataframe(pd.DataFrame([{
+            "Remnant ID": b.remnant_id,
+            "Length(mm)": b.length,
+            "Cuts": ", ".join(map(str, b.cuts)),
+            "Used(mm)": sum(b.cuts),
+            "Remain(mm)": b.remain,
+        } for b in remnant_bars]), use_container_width=True)
+
+    if update_remnants:
+        kept = new_remnants(bars + remnant_bars, chuck_len, min_remnant)
+        store.consume(b.remnant_id for b in remnant_bars)
+        store.add(kept, pipe_spec)
+        st.info(f"Remnant inventory updated: {len(remnant_bars)} used, {len(kept)} stored")
+
+    # ▶ 하한 & 최적성 갭
+    lb_text = (f"Lower Bound: {sol['lower_bound']} bars "
+               f"(continuous {sol['lb_continuous']}, L2 {sol['lb_l2']})")
+    gap = len(bars) - sol["lower_bound"]
+    if gap == 0:
+        st.success(f"✅ Proven optimal | {lb_text}")
+    else:
+        st.warning(f"Gap: {gap} bars ({gap / sol['lower_bound'] * 100:.1f}%) | {lb_text} | phase: {sol['phase']}")
 
     # ── CSV 다운로드
     csv = result_df.to_csv(index=False).encode("utf-8-sig")
     st.download_button("Download as CSV", csv, "cutting_patterns.csv", "text/csv")
+
+    timing.note(bars=len(bars), patterns=len(pattern_dict), lower_bound=sol["lower_bound"])
+    timing.finish(tr)
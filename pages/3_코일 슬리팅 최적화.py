@@ -1,203 +1,163 @@
+import time
+
 import streamlit as st
 import pandas as pd
-import pulp
-import re
-from itertools import combinations
+
+from core.bulk_import import import_once
+from core.coils import CoilInventory, rows_from_stock
+from core.parsers import parse_lot_list, parse_names, parse_orders
+from core.slitting import assign_orders, cluster_orders, match_thk, plan_table, solve_group
+from core.verify import verify_slitting
+from core import timing
 
 st.set_page_config(page_title="코일 품명 파서 및 슬리팅 최적화", layout="wide")
 st.title("🧾 품명 자동 파싱 + 🔧 슬리팅 최적화")
 
-# 🔧 파싱 함수 정의 (LOSS 제외)
-def parse_name_final(name: str):
-    name = name.strip().upper()
-    if name.startswith("LOSS"):
-        return None, None
-    match = re.search(r'(\d+(?:\.\d+)?)[Tt]?[xX×](\d+(?:\.\d+)?)', name)
-    if match:
-        return float(match.group(1)), float(match.group(2))
-    return None, None
-
 # 📋 주문 리스트 입력
 st.subheader("1️⃣ 주문 리스트")
-orders_raw = pd.DataFrame(columns=["name"])
-orders_raw = st.data_editor(orders_raw, num_rows="dynamic", key="orders_raw")
-orders = pd.DataFrame()
-if not orders_raw.empty:
-    orders_raw["name"] = orders_raw["name"].astype(str)
-    parsed = orders_raw["name"].apply(parse_name_final)
-    orders = pd.DataFrame(parsed.tolist(), columns=["thickness", "width"])
-    orders = orders.dropna()
-    orders["demand"] = 1
-    orders["thk_id"] = (orders["thickness"] * 1000).round().astype(int)
-    st.dataframe(orders, use_container_width=True)
+orders_file = st.file_uploader("📂 주문 파일 업로드 (XLSX/CSV, 첫 열 = 품명, 둘째 열 = 주문 kg 선택)",
+                               type=["xlsx", "csv"], key="orders_file")
+orders = import_once(st.session_state, "orders_import", orders_file, parse_orders)
+if orders is None:
+    orders_raw = pd.DataFrame({"name": pd.Series(dtype=str), "kg": pd.Series(dtype=float)})
+    orders_raw = st.data_editor(orders_raw, num_rows="dynamic", key="orders_raw")
+    orders = parse_orders(orders_raw) if not orders_raw.empty else pd.DataFrame()
+if not orders.empty:
+    st.caption(f"{len(orders):,}건")
+    st.dataframe(orders.head(200), use_container_width=True)
 
 # 📋 Filler 리스트 입력
 st.subheader("2️⃣ Filler 리스트")
-fillers_raw = pd.DataFrame(columns=["name"])
-fillers_raw = st.data_editor(fillers_raw, num_rows="dynamic", key="fillers_raw")
-fillers = pd.DataFrame()
-if not fillers_raw.empty:
-    fillers_raw["name"] = fillers_raw["name"].astype(str)
-    parsed = fillers_raw["name"].apply(parse_name_final)
-    fillers = pd.DataFrame(parsed.tolist(), columns=["thickness", "width"])
-    fillers = fillers.dropna()
-    fillers["thk_id"] = (fillers["thickness"] * 1000).round().astype(int)
-    st.dataframe(fillers, use_container_width=True)
+fillers_file = st.file_uploader("📂 Filler 파일 업로드 (XLSX/CSV, 첫 열 = 품명)", type=["xlsx", "csv"], key="fillers_file")
+fillers = import_once(st.session_state, "fillers_import", fillers_file, lambda c: parse_names(c.iloc[:, 0]))
+if fillers is None:
+    fillers_raw = pd.DataFrame(columns=["name"])
+    fillers_raw = st.data_editor(fillers_raw, num_rows="dynamic", key="fillers_raw")
+    fillers = parse_names(fillers_raw["name"]) if not fillers_raw.empty else pd.DataFrame()
+if not fillers.empty:
+    st.dataframe(fillers.head(200), use_container_width=True)
 
 # 📋 LOT 리스트 입력
 st.subheader("3️⃣ LOT 리스트")
-lot_raw = pd.DataFrame(columns=["LOT_NO", "weight", "vendor"])
-lot_raw = st.data_editor(lot_raw, num_rows="dynamic", key="lot_raw")
+lot_file = st.file_uploader("📂 LOT 파일 업로드 (XLSX/CSV: LOT_NO, weight, vendor)", type=["xlsx", "csv"], key="lot_file")
 stock = pd.DataFrame()
-if not lot_raw.empty:
-    try:
-        lot_raw["weight"] = lot_raw["weight"].astype(str).str.replace(",", "").astype(float)
-        tok1 = lot_raw["LOT_NO"].str.split().str[0]
-        tok2 = lot_raw["LOT_NO"].str.split().str[1]
-        mt = tok1.str.extract(r"([A-Z]+)(\d+)")
-        stock = pd.DataFrame({
-            "coil_id": lot_raw["LOT_NO"],
-            "vendor": lot_raw["vendor"],
-            "thickness": (mt[1].astype(int) / 100).round(2),
-            "width": tok2.str.extract(r"(\d{3,4})")[0].astype(int),
-            "weight": lot_raw["weight"],
-            "qty": 1
-        })
-        stock["thk_id"] = (stock["thickness"] * 1000).round().astype(int)
-        st.dataframe(stock, use_container_width=True)
-    except:
-        st.warning("❗ LOT_NO 파싱 오류")
+try:
+    lot_import = import_once(st.session_state, "lot_import", lot_file, parse_lot_list)
+except Exception:
+    lot_import = None
+    st.warning("❗ LOT 파일 파싱 오류")
+if lot_import is not None:
+    stock = lot_import
+    st.caption(f"{len(stock):,} LOT")
+    st.dataframe(stock.head(200), use_container_width=True)
 else:
-    st.info("📝 위에 LOT_NO를 입력해주세요 (예: SPCC750 1250)")
-
-# 최적화 관련 함수들
-def match_thk(df, thk_id):
-    if thk_id in (750, 800):
-        return df[df["thk_id"].isin([750, 800])]
-    return df[df["thk_id"] == thk_id]
-
-def best_fill(remain, slots):
-    combs = []
-    for r in range(1, len(slots)+1):
-        for c in combinations(slots, r):
-            s = sum(c)
-            if s <= remain:
-                combs.append((c, remain - s))
-    combs.append(((), remain))
-    return sorted(combs, key=lambda x: x[1])
-
-def gen_preview(w, ords, fills, N=5):
-    pats = []
-    L = len(ords)
-    for w0 in ords:
-        if w0 <= w:
-            bf = best_fill(w - w0, fills)
-            total = w0 + sum(bf[0][0])
-            waste = w - total
-            pats.append(([w0] + list(bf[0][0]), waste))
-    for k in range(L, 1, -1):
-        for cmb in combinations(ords, k):
-            t = sum(cmb)
-            if t <= w:
-                bf = best_fill(w - t, fills)
-                for c, _ in bf[:N]:
-                    total = t + sum(c)
-                    waste = w - total
-                    pats.append((list(cmb) + list(c), waste))
-    seen, uni = set(), []
-    for s, l in pats:
-        key = tuple(sorted(s))
-        if key not in seen:
-            seen.add(key)
-            uni.append((s, l))
-    uni.sort(key=lambda x: x[1])
-    return uni[:N * 2]  # 다양한 옵션 확보
+    lot_raw = pd.DataFrame(columns=["LOT_NO", "weight", "vendor"])
+    lot_raw = st.data_editor(lot_raw, num_rows="dynamic", key="lot_raw")
+    if not lot_raw.empty:
+        try:
+            stock = parse_lot_list(lot_raw)
+            st.dataframe(stock, use_container_width=True)
+        except:
+            st.warning("❗ LOT_NO 파싱 오류")
+    else:
+        st.info("📝 위에 LOT_NO를 입력해주세요 (예: SPCC750 1250)")
+
+# 📦 코일 재고 DB (SQLite)
+inventory = CoilInventory()
+c1, c2 = st.columns([3, 1])
+use_db = c1.checkbox(f"📦 저장된 코일 재고 사용 (DB {inventory.count():,} LOT)", key="use_coil_db")
+if c2.button("💾 LOT 리스트를 재고 DB에 저장", disabled=stock.empty):
+    n = inventory.upsert(rows_from_stock(stock))
+    st.success(f"{n:,} LOT 저장 완료")
 
 # 📊 최적화 실행
 st.subheader("4️⃣ 최적화 실행")
-if st.button("▶ 슬리팅 최적화 시작"):
-    if orders.empty or stock.empty:
-        st.error("❌ 주문 또는 재고 없음")
-        st.stop()
-
-    results_all = []
-    for thk, grp in stock.groupby("thk_id"):
-        df_o = match_thk(orders, thk)
+timing.profile_button("slitting")
+t1, t2 = st.columns(2)
+tol = t1.number_input("📏 폭 허용오차 (mm) – 이 범위 안의 주문 폭은 넓은 폭 하나로 묶어 계산", 0, 10, 0)
+compare = t2.checkbox("⏱ 묶지 않은 원래 폭으로도 풀어 시간 비교", disabled=tol == 0)
+by = "kg" if st.radio("수요 기준", ["스트립 개수", "중량(kg)"], horizontal=True) == "중량(kg)" else "count"
+
+
+def run_groups(ord_df, show=True):
+    """두께 그룹별 solve_group → (결과 행, 사용 재고 프레임 목록)"""
+    results, used = [], []
+    thk_list = inventory.thk_ids() if use_db else sorted(stock["thk_id"].unique())
+    for thk in thk_list:
+        df_o = match_thk(ord_df, thk)
         if df_o.empty:
             continue
-
-        demands = df_o.groupby("width")["demand"].sum().to_dict()
-        wids = sorted(demands)
-        all_patterns = {}
-        waste_dict = {}
-
-        for _, row in grp.iterrows():
-            coil_id = row["coil_id"]
-            cw = int(row["width"])
-            ord_ws = [wid for wid in wids if wid <= cw]
-            fills = match_thk(fillers, thk)["width"].tolist()
-            raw = gen_preview(cw, ord_ws, fills, N=5)
-            vecs = []
-            waste_vals = []
-            for slots, _ in raw:
-                count_dict = {w: 0 for w in wids}
-                for s in slots:
-                    if s in count_dict:
-                        count_dict[s] += 1
-                vec = [count_dict[w] for w in wids]
-                vecs.append(vec)
-                used_width = sum(slots)
-                true_waste = cw - used_width
-                waste_vals.append(true_waste)
-            all_patterns[coil_id] = vecs
-            waste_dict[coil_id] = waste_vals
-
-        if not all_patterns:
-            st.warning(f"🔸 두께 {thk/1000}t에 유효 패턴 없음")
+        if use_db:
+            # 인덱스 조회: 두께 일치 + 가장 좁은 주문 폭 이상
+            with timing.span("db_candidates", thk_id=int(thk)):
+                grp = inventory.candidates([thk], min_width=int(df_o["width"].min()))
+        else:
+            grp = stock[stock["thk_id"] == thk]
+        if grp.empty:
             continue
+        used.append(grp)
 
-        model = pulp.LpProblem(f"Cut_{thk}", pulp.LpMinimize)
-        x = {}
-        for coil_id, pats in all_patterns.items():
-            for p_idx in range(len(pats)):
-                x[(coil_id, p_idx)] = pulp.LpVariable(f"x_{coil_id}_{p_idx}", cat="Binary")
-
-        model += pulp.lpSum(waste_dict[coil_id][p] * x[(coil_id, p)]
-                            for coil_id in all_patterns
-                            for p in range(len(all_patterns[coil_id])))
-
-        for coil_id, pats in all_patterns.items():
-            model += pulp.lpSum(x[(coil_id, p)] for p in range(len(pats))) <= 1
-
-        for j, w in enumerate(wids):
-            model += pulp.lpSum(
-                all_patterns[coil_id][p][j] * x[(coil_id, p)]
-                for coil_id in all_patterns
-                for p in range(len(all_patterns[coil_id]))
-            ) >= int(demands[w])
-
-        status = model.solve(pulp.PULP_CBC_CMD(msg=False))
-        if pulp.LpStatus[status] != "Optimal":
+        status, rows = solve_group(thk, grp, df_o, fillers, by=by)
+        if show and status == "no_patterns":
+            st.warning(f"🔸 두께 {thk/1000}t에 유효 패턴 없음")
+        elif show and status == "failed":
             st.warning(f"❌ 두께 {thk/1000}t 최적화 실패")
-            continue
+        results.extend(rows)
+    return results, used
+
 
-        for (coil_id, p_idx), var in x.items():
-            if var.value() > 0.5:
-                pat = all_patterns[coil_id][p_idx]
-                waste = waste_dict[coil_id][p_idx]
-                slot_desc = [f"{w}×{pat[i]}" for i, w in enumerate(wids) if pat[i] > 0]
-                results_all.append({
-                    "thickness": thk / 1000,
-                    "coil": coil_id,
-                    "pattern": "+".join(slot_desc),
-                    "waste": round(waste, 1)
-                })
+if st.button("▶ 슬리팅 최적화 시작"):
+    if orders.empty or (stock.empty and not use_db):
+        st.error("❌ 주문 또는 재고 없음")
+        st.stop()
+    if by == "kg":
+        if orders["demand_kg"].isna().all():
+            st.error("❌ 주문 kg이 없습니다 (주문 표 둘째 열)")
+            st.stop()
+        if orders["demand_kg"].isna().any():
+            st.warning(f"🔸 kg이 비어 있는 주문 {int(orders['demand_kg'].isna().sum())}건은 0kg으로 계산")
+
+    tr = timing.start("slitting_optimizer", profile=timing.take_profile("slitting"),
+                      orders=len(orders), lots=inventory.count() if use_db else len(stock), use_db=use_db, tol=tol,
+                      by=by)
+    # 📏 폭 허용오차 묶기 → 대표 폭으로 풀고 원래 주문에 되돌려 배정
+    run_orders = orders
+    if tol:
+        run_orders, shrink = cluster_orders(orders, tol)
+        st.info(f"📏 주문 폭 {shrink['widths_before']}개 → {shrink['widths_after']}개 "
+                f"(수요 제약 {shrink['widths_before'] - shrink['widths_after']}개 감소)")
+        if shrink["merged"]:
+            st.caption(" / ".join(f"{t}t: {'·'.join(f'{w:g}' for w in ws)} → {r:g}"
+                                  for t, ws, r in shrink["merged"]))
+
+    t0 = time.perf_counter()
+    results_all, used_stock = run_groups(run_orders)
+    elapsed = time.perf_counter() - t0
+    if tol:
+        assign_orders(results_all, run_orders, by)
+        if compare:
+            with timing.span("baseline_solve"):
+                t0 = time.perf_counter()
+                run_groups(orders, show=False)
+                base = time.perf_counter() - t0
+            st.info(f"⏱ 풀이 시간 {base:.2f}s → {elapsed:.2f}s (절감 {base - elapsed:.2f}s)")
 
     if not results_all:
         st.warning("최적화 결과 없음")
     else:
-        df_res = pd.DataFrame(results_all)
+        # ✔ 계획 검증 (수요 충족 · 코일 폭 · 두께 · 폐폭 재계산)
+        with timing.span("verify"):
+            chk = verify_slitting(results_all, run_orders, pd.concat(used_stock, ignore_index=True), by)
+        df_res = plan_table(results_all)
         st.success("✅ 최적화 완료")
+        if chk["ok"] and by == "kg":
+            st.caption(f"✔ 검증 통과 | 수율 {chk['yield_pct']}% | 주문 {chk['demand_kg']:,.0f} kg → "
+                       f"생산 {chk['order_kg']:,.0f} kg (초과 {chk['surplus_kg']:,.0f} kg)")
+        elif chk["ok"]:
+            st.caption(f"✔ 검증 통과 | 수율 {chk['yield_pct']}% | 폐폭 합계 {chk['waste_mm']:,} mm"
+                       + (f" | 초과 생산 {chk['surplus']}" if chk["surplus"] else ""))
+        else:
+            st.error(f"❌ 검증 실패 ({chk['n_errors']}건)\n\n" + "\n".join(f"- {e}" for e in chk["errors"]))
         st.dataframe(df_res, use_container_width=True)
         st.download_button(
             "📥 다운로드 (CSV)",
@@ -205,3 +165,4 @@ if st.button("▶ 슬리팅 최적화 시작"):
             "cutting_plan.csv",
             "text/csv"
         )
+    timing.finish(tr)
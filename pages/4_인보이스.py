@@ -1,10 +1,15 @@
 
 import streamlit as st
 import pandas as pd
-import re, json, os
 from datetime import datetime, timedelta
 import streamlit.components.v1 as components
 
+from core.bulk_import import file_key
+from core.invoice import aggregate, parse_invoice, parse_many, report_xlsx
+from core.letter import letter, letters_zip
+from core.settings import SettingsStore, current_user
+from core import timing
+
 st.set_page_config(page_title="인보이스 품명 번역기 + 협조전", page_icon="📄", layout="wide")
 st.title("📄 인보이스 품명 자동 생성기 + 협조전")
 
@@ -21,119 +26,19 @@ DEFAULT_CFG = {
         "Ruijing Subdistrict, Beichen District, Tianjin, China"
     )
 }
-if os.path.exists(CFG_FILE):
-    cfg = json.load(open(CFG_FILE, encoding="utf-8"))
-    cfg = {**DEFAULT_CFG, **cfg}
-else:
-    cfg = DEFAULT_CFG.copy()
+settings = SettingsStore(CFG_FILE, DEFAULT_CFG)
+user = current_user()
+cfg = settings.get(user)
 
 def save_cfg():
-    json.dump(cfg, open(CFG_FILE, "w", encoding="utf-8"), ensure_ascii=False, indent=2)
-
-SIZE_RE = re.compile(r"(\d{2,4})\s*[＊*×xX]\s*(\d{2,4})")
-DATE_RE = re.compile(r"([A-Z][a-z]{2})\.?(\d{1,2})th,?\s*(\d{4})")
-
-def safe_int(v):
-    try:
-        return int(float(str(v).replace(",", "").strip()))
-    except Exception:
-        return None
-
-def eval_int(v):
-    try:
-        return int(eval(str(v).replace("=", "").strip()))
-    except Exception:
-        return safe_int(v)
-
-def extract_size(s):
-    m = SIZE_RE.search(s)
-    return f"{m.group(1)}x{m.group(2)}" if m else ""
-
-def make_kor(cn, size, ratio):
-    base = "FM슬림곤도라" if ratio == 8 else "FM곤도라"
-    color = "무도장" if "本色" in cn else ("다크그레이" if ratio == 8 else "딥그레이")
-    sub = re.search(r"[（(](.+?)[）)]", cn)
-    sub = sub.group(1) if sub else ""
-    mids = {
-        "中层板": "중선반", "底层板": "밑선반", "END·中": "END라운드중선반",
-        "END·底": "END라운드밑선반", "下连杆": "하연결대", "前罩": "앞장", "安全销": "안전핀",
-    }
-    mid = next((mids[k] for k in mids if k in sub), "기타")
-    return f"{base} {mid}{(' ' + size) if size else ''} {color}".replace("*", "x").strip()
-
-def infer_cols(df: pd.DataFrame) -> pd.DataFrame:
-    cmap = {}
-    for c in df.columns:
-        s = df[c].astype(str).head(10)
-        if any(SIZE_RE.search(v) for v in s):
-            cmap[c] = "규격"
-        elif any("SHELF" in v.upper() for v in s):
-            cmap[c] = "품명"
-        elif s.str.fullmatch(r"\d{1,6}").all():
-            if "Package" not in cmap.values():
-                cmap[c] = "Package"
-            elif "Pieces" not in cmap.values():
-                cmap[c] = "Pieces"
-    df.rename(columns=cmap, inplace=True)
-    if "규격" not in df.columns:
-        df["규격"] = df.apply(
-            lambda r: next((extract_size(str(v)) for v in r.values if isinstance(v, str) and SIZE_RE.search(v)), ""),
-            axis=1,
-        )
-    return df
+    settings.update(cfg, user)   # 바뀐 값이 있을 때만 파일에 쓴다
 
 def run(df: pd.DataFrame):
-    df = infer_cols(df.applymap(lambda x: x.strip() if isinstance(x, str) else x))
-    kor_list, qty, usd, ship_date = [], 0, 0.0, None
-
-    for _, row in df.iterrows():
-        row_join = " ".join(str(v) for v in row.values if isinstance(v, str))
-        if "Sailing on" in row_join:
-            m = DATE_RE.search(row_join)
-            if m:
-                mon, day, yr = m.groups()
-                ship_date = datetime.strptime(f"{yr}-{mon}-{day}", "%Y-%b-%d").date()
-            continue
-
-        if str(row.get("Item", "")).upper().startswith(("TOTAL", "소계", "합계")):
-            try:
-                usd = float(str(row.dropna().iloc[-1]).replace(",", ""))
-            except Exception:
-                pass
-            continue
-
-        desc = str(row.get("품명", "")).strip()
-        if not desc:
-            continue
-
-        size = str(row.get("규격", "")).strip()
-        if size.startswith("="):
-            try:
-                size = str(eval(size.lstrip("=")))
-            except Exception:
-                size = ""
-        if not SIZE_RE.search(size):
-            size = extract_size(desc)
-
-        pkg = eval_int(row.get("Package", ""))
-        pcs = safe_int(row.get("Pieces", ""))
-
-        ratio = round(pcs / pkg) if pkg and pcs else 8
-        kor_list.append(make_kor(desc, size, ratio))
-
-    # ✅ Pieces 열의 모든 숫자 추출 후 합산
-    try:
-        qty = (
-            df["Pieces"]
-            .dropna()
-            .astype(str)
-            .apply(lambda x: sum(map(float, re.findall(r"\d+(?:\.\d+)?", x))))
-            .sum()
-        )
-        qty = int(qty) if qty == int(qty) else round(qty, 2)
-    except Exception as e:
-        st.error(f"❌ 수량 계산 오류: {e}")
-        qty = 0
+    with timing.span("parse_invoice"):
+        res = parse_invoice(df)
+    kor_list, qty, usd, ship_date = res["kor_list"], res["qty"], res["usd"], res["ship_date"]
+    if res["qty_error"]:
+        st.error(f"❌ 수량 계산 오류: {res['qty_error']}")
 
     st.markdown("### ✅ 생성된 한국품명 리스트")
     st.text_area("미리보기", "\n".join(kor_list[1:]), height=200)
@@ -153,52 +58,8 @@ def run(df: pd.DataFrame):
         cfg["bank_address"] = st.text_area("bank_address", value=cfg["bank_address"], height=100)
     save_cfg()
 
-    main_item = kor_list[1] if len(kor_list) > 1 else "FM곤도라 중선반 800×300 다크그레이"
-    others = max(len(set(kor_list[1:])) - 1, 0)
-    krw, cny = 1400.39, 7.2405
-
-    letter = f"""중국 2025-{cheosu}차 수입 물품({load_dt.month}/{load_dt.day} 상차, {in_dt.month}/{in_dt.day} 입고 예정분) 대금 지급을 요청합니다.
-
-* 지급 업체 :
-    {cfg['beneficiary']}
-
-* 은행정보 :
-    ACCOUNT NUMBER : {cfg['account_number']}
-    BENEFICIARY BANK : {cfg['bank']}
-    SWIFT CODE : {cfg['swift']}
-
-* BANK ADDRESS :
-    {cfg['bank_address']}
-
-* 지급 요청 금액 :
-    ${usd:,.2f}
-
-* 운송컨테이너 :
-    {cfg['container']}
-
-* 수입품 내역 :
-    {main_item} 외 {others}품목   {qty} EA
-
-* 수입품 금액 :
-    ${usd:,.2f} = ₩{int(usd*krw):,} = ￥{int(usd*cny):,}
-
-※ 환율({datetime.today().date()}) : ₩{krw}/$, ￥{cny}/$
-
-※ 지급 사유 :
-    24차 12/3 입고분 대금 지급 보류(담보성)
-    {cheosu}차 {in_dt.month}/{in_dt.day} 입고 예정
-    제조업체 자금 부족
-"""
-
-    hl = [cfg["beneficiary"], cfg["account_number"], cfg["bank"], cfg["swift"]] + cfg["bank_address"].splitlines()
-    html = "<br>".join("&nbsp;" * (len(l) - len(l.lstrip())) + l.lstrip() for l in letter.split("\n"))
-
-    def mark(html_src: str, target: str):
-        pattern = re.compile(r"\s+".join(map(re.escape, target.split())), flags=re.IGNORECASE)
-        return pattern.sub(lambda m: f'<b><font color="red">{m.group()}</font></b>', html_src)
-
-    for t in hl:
-        html = mark(html, t)
+    with timing.span("letter"):
+        _, html = letter(cfg, cheosu, load_dt, in_dt, kor_list[1:], qty, usd)
 
     components.html(
         f"""
@@ -232,7 +93,72 @@ st.markdown("#### 📋 엑셀 표를 복사 → 첫 셀에 Ctrl+V")
 cols = ["Item", "Description", "규격", "Package", "NO of PACK", "Pieces", "Unit Price", "Amount"]
 grid = st.data_editor(pd.DataFrame(columns=cols), num_rows="dynamic", key="invoice", use_container_width=True, hide_index=True)
 
-if not grid.dropna(how="all").empty:
-    run(grid.dropna(how="all").copy())
+data = grid.dropna(how="all")
+if not data.empty:
+    # 표 내용이 바뀐 실행만 로그에 남김 (날짜 · 설정 위젯 조작 rerun 제외)
+    sig = int(pd.util.hash_pandas_object(data.astype(str), index=False).sum())
+    tr = timing.start("invoice", rows=len(data)) if st.session_state.get("invoice_timed") != sig else None
+    st.session_state.invoice_timed = sig
+    run(data.copy())
+    if tr:
+        timing.finish(tr)
 else:
     st.info("그리드 첫 셀 클릭 후 Ctrl+V 하세요.")
+
+# ───────────────── 월말 일괄 처리 ─────────────────
+st.markdown("---")
+st.markdown("#### 📦 인보이스 일괄 집계 (XLSX 여러 개)")
+files = st.file_uploader("인보이스 XLSX", type=["xlsx"], accept_multiple_files=True, key="invoice_files")
+if not files:
+    st.session_state.pop("invoice_batch", None)
+else:
+    # 파일 내용이 바뀐 경우에만 다시 파싱 (차수 · 일수 입력 등 rerun에서는 보관 결과 사용)
+    file_id = tuple(file_key(f) for f in files)
+    cached = st.session_state.get("invoice_batch")
+    tr = None
+    if cached is None or cached[0] != file_id:
+        tr = timing.start("invoice_batch", files=len(files))
+        with st.spinner(f"{len(files)}개 파일 파싱 중..."):
+            with timing.span("parse_many", files=len(files)):
+                results = parse_many([(f.name, f.getvalue()) for f in files])
+            cached = (file_id, results, aggregate(results))
+        st.session_state.invoice_batch = cached
+    _, results, (summary, items, file_df) = cached
+
+    failed = file_df[file_df["오류"] != ""]
+    if not failed.empty:
+        st.warning(f"⚠️ {len(failed)}개 파일 확인 필요: " + ", ".join(failed["파일"]))
+    c1, c2, c3 = st.columns(3)
+    c1.metric("파일", len(files))
+    c2.metric("총 수량", f"{int(summary['수량'].sum()):,} EA")
+    c3.metric("총 금액", f"${summary['USD'].sum():,.2f}")
+
+    st.markdown("**선적일(Sailing on)별 요약**")
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    with st.expander("품목별 집계"):
+        st.dataframe(items, use_container_width=True, hide_index=True)
+    with st.expander("파일별 결과"):
+        st.dataframe(file_df, use_container_width=True, hide_index=True)
+
+    st.download_button("📥 통합 보고서 (XLSX)", report_xlsx(summary, items, file_df),
+                       file_name=f"invoice_report_{datetime.today():%Y%m%d}.xlsx",
+                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+    # 선적일마다 협조전 1건 (차수는 시작 번호부터 선적일 순으로)
+    dated = [r for r in results if r["ship_date"]]
+    if dated:
+        c1, c2 = st.columns(2)
+        first = c1.number_input("시작 수입 차수", min_value=1, value=1, step=1, key="batch_cheosu")
+        days = c2.number_input("입고까지 일수", min_value=0, value=6, step=1, key="batch_days")
+        batches = []
+        for i, d in enumerate(sorted({r["ship_date"] for r in dated})):
+            grp = [r for r in dated if r["ship_date"] == d]
+            batches.append({"cheosu": int(first) + i, "load_dt": d, "in_dt": d + timedelta(days=int(days)),
+                            "kor_list": [k for r in grp for k in r["kor_list"]],
+                            "qty": sum(r["qty"] for r in grp), "usd": sum(r["usd"] for r in grp)})
+        with timing.span("letters", batches=len(batches)):
+            zipped = letters_zip(batches, cfg)
+        st.download_button(f"📥 협조전 {len(batches)}건 (HTML · TXT, zip)", zipped,
+                           file_name=f"letters_{datetime.today():%Y%m%d}.zip", mime="application/zip")
+    if tr:
+        timing.finish(tr)
@@ -16,6 +16,12 @@ from datetime import datetime
 import streamlit as st
 import pandas as pd
 
+from core.bulk_import import import_once
+from core.coils import CoilInventory, rows_from_coil_lots
+from core.editor_diff import RowParser, changed_positions
+from core.parsers import parse_coil_lots, parse_product_names, pick_columns
+from core import timing
+
 # -------------------------------------------------------------------
 # 1) Data Editor Wrapper
 # -------------------------------------------------------------------
@@ -29,6 +35,26 @@ def data_editor(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
         st.error("이 버전의 Streamlit에서는 Data Editor를 사용할 수 없습니다.")
         return df
 
+def upload_section(label: str, key: str, parser) -> pd.DataFrame:
+    """XLSX/CSV 업로드 → 파싱 결과를 세션에 보관 (전체 그리드는 다시 그리지 않음)"""
+    f = st.file_uploader(label, type=["xlsx", "csv"], key=f"{key}_file")
+    df = import_once(st.session_state, f"{key}_import", f, parser)
+    if df is not None:
+        st.success(f"{len(df):,}행 업로드됨")
+        st.dataframe(df.head(50))
+    return df
+
+def parse_order_rows(chunk: pd.DataFrame) -> pd.DataFrame:
+    df = pick_columns(chunk, ["product_name", "quantity"]).reset_index(drop=True)
+    df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce").fillna(0).astype(int)
+    return pd.concat([df, parse_product_names(df["product_name"])], axis=1)
+
+def parse_safety_rows(chunk: pd.DataFrame) -> pd.DataFrame:
+    df = pick_columns(chunk, ["product_name", "safety_stock", "current_stock"]).reset_index(drop=True)
+    for c in ("safety_stock", "current_stock"):
+        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
+    return pd.concat([df, parse_product_names(df["product_name"])], axis=1)
+
 # -------------------------------------------------------------------
 # 2) 코일 LOT 파싱 함수
 # -------------------------------------------------------------------
@@ -98,13 +124,11 @@ def parse_product_name(item_name: str):
 # -------------------------------------------------------------------
 def init_session_state():
     # 4-1) 코일 재고: LOT NO만
+    # 재고 DB는 3번 페이지와 공용 → 이 페이지 형식으로 읽히는 LOT만 편집·동기화 대상
     if "df_coil_inventory" not in st.session_state:
-        st.session_state.df_coil_inventory = pd.DataFrame({
-            "coil_lot_no": [
-                "CR060 1038C11200 250306-1",
-                "CR075 1219C12700 250401-1"
-            ]
-        })
+        saved = saved_lots()
+        st.session_state.df_coil_inventory = pd.DataFrame({"coil_lot_no": pd.Series(saved, dtype=str)})
+        st.session_state.coil_db_synced = set(saved)
     # 4-2) 주문: 품명 + 수량
     if "df_orders" not in st.session_state:
         st.session_state.df_orders = pd.DataFrame({
@@ -125,6 +149,49 @@ def init_session_state():
     if "slitting_result" not in st.session_state:
         st.session_state.slitting_result = None
 
+def saved_lots():
+    """재고 DB LOT 중 COIL_LOT_RE 형식(이 페이지에서 입력한 LOT)만"""
+    lots = pd.Series(CoilInventory().lot_nos(), dtype=str)
+    return rows_from_coil_lots(parse_coil_lots(lots))["lot_no"].tolist()
+
+def sync_inventory(parsed: pd.DataFrame, delete_missing: bool = True):
+    """
+    파싱된 LOT ↔ 재고 DB 동기화 (새 LOT만 upsert, 빠진 LOT 삭제)
+    삭제는 이 페이지가 읽어 들였던 LOT(coil_db_synced) 중 사용자가 지운 것만 – 다른 페이지 LOT은 건드리지 않는다.
+    """
+    inv = CoilInventory()
+    rows = rows_from_coil_lots(parsed)
+    synced = st.session_state.get("coil_db_synced", set())
+    current = set(rows["lot_no"])
+    new = rows[~rows["lot_no"].isin(synced)]
+    if not new.empty:
+        inv.upsert(new)
+    if delete_missing and synced - current:
+        inv.delete(synced - current)
+        synced = synced & current
+    st.session_state.coil_db_synced = synced | current
+
+PARSED_COLUMNS = ["raw_name", "product", "thickness_mm", "width_mm", "material"]
+
+def edit_with_parse(state_key: str, input_cols: list, editor_key: str):
+    """
+    입력 열만 에디터 기준 데이터(base)로 두고, 바뀐 행의 품명만 다시 파싱한다.
+    session_state[state_key] = 입력 열 + 파싱 열 (고정 스키마)
+    """
+    base_key, parser_key = f"{state_key}_base", f"{state_key}_parser"
+    if parser_key not in st.session_state:
+        st.session_state[parser_key] = RowParser(parse_product_name, PARSED_COLUMNS)
+    # 에디터가 새로 그려질 때(메뉴 이동·업로드 해제 후) 최신 데이터로 기준 재설정
+    fresh = editor_key not in st.session_state or base_key not in st.session_state
+    if fresh:
+        st.session_state[base_key] = st.session_state[state_key][input_cols].reset_index(drop=True)
+    base = st.session_state[base_key]
+
+    edited = data_editor(base, num_rows="dynamic", key=editor_key).reset_index(drop=True)
+    changed = None if fresh else changed_positions(st.session_state.get(editor_key), len(base))
+    parsed = st.session_state[parser_key].update(edited["product_name"], changed)
+    return edited, parsed
+
 # -------------------------------------------------------------------
 # 5) Demo Slitting Solver
 # -------------------------------------------------------------------
@@ -160,33 +227,39 @@ def page_inventory_input():
     st.title("현재 재고 입력/확인")
     st.write("▶ Streamlit version:", st.__version__)
 
+    imported = upload_section("📂 LOT 파일 업로드 (XLSX/CSV, 첫 열 = LOT NO)", "coil_inv",
+                              lambda c: parse_coil_lots(c.iloc[:, 0]))
+    if imported is not None:
+        # 입고 리스트 → 재고 DB 일괄 upsert (기존 LOT 유지)
+        sync_inventory(imported, delete_missing=False)
+        st.session_state.df_coil_inventory = pd.DataFrame({"coil_lot_no": pd.Series(saved_lots(), dtype=str)})
+        return
+
     df = st.session_state.df_coil_inventory
     edited = data_editor(df, num_rows="dynamic", key="coil_inv_editor")
     st.session_state.df_coil_inventory = edited.fillna("")
 
     st.success("코일 LOT 리스트가 업데이트되었습니다.")
 
-    parsed = []
-    for lot in st.session_state.df_coil_inventory["coil_lot_no"]:
-        if lot.strip():
-            try:
-                parsed.append(parse_coil_lot(lot))
-            except:
-                parsed.append({})
-    if parsed:
+    lots = st.session_state.df_coil_inventory["coil_lot_no"].astype(str)
+    parsed = parse_coil_lots(lots[lots.str.strip() != ""])
+    sync_inventory(parsed)
+    if not parsed.empty:
         st.write("#### 파싱된 LOT 정보")
-        st.dataframe(pd.DataFrame(parsed))
+        st.dataframe(parsed)
 
 def page_orders_input():
     st.title("주문 입력")
     st.write("품명(product_name)과 수량(quantity)을 입력하세요.")
-    df = st.session_state.df_orders
-    edited = data_editor(df, num_rows="dynamic", key="orders_editor")
+    imported = upload_section("📂 주문 파일 업로드 (XLSX/CSV: product_name, quantity)", "orders", parse_order_rows)
+    if imported is not None:
+        st.session_state.df_orders = imported
+        st.session_state.pop("df_orders_parser", None)
+        return
+    # 파싱 적용 (변경 행만)
+    edited, df_parsed = edit_with_parse("df_orders", ["product_name", "quantity"], "orders_editor")
     # 수량 컬럼 정수 변환
     edited["quantity"] = pd.to_numeric(edited["quantity"], errors="coerce").fillna(0).astype(int)
-    # 파싱 적용
-    parsed = edited["product_name"].apply(parse_product_name)
-    df_parsed = pd.json_normalize(parsed)
     st.session_state.df_orders = pd.concat([edited, df_parsed], axis=1)
     st.write("#### 파싱된 주문 정보")
     st.dataframe(df_parsed)
@@ -195,11 +268,15 @@ def page_orders_input():
 def page_safety_stock():
     st.title("안전재고 설정")
     st.write("품명(product_name)과 안전재고, 현재재고를 입력하세요.")
-    df = st.session_state.df_safety_stock
-    edited = data_editor(df, num_rows="dynamic", key="safety_editor")
-    # 파싱 적용
-    parsed = edited["product_name"].apply(parse_product_name)
-    df_parsed = pd.json_normalize(parsed)
+    imported = upload_section("📂 안전재고 파일 업로드 (XLSX/CSV: product_name, safety_stock, current_stock)",
+                              "safety", parse_safety_rows)
+    if imported is not None:
+        st.session_state.df_safety_stock = imported
+        st.session_state.pop("df_safety_stock_parser", None)
+        return
+    # 파싱 적용 (변경 행만)
+    edited, df_parsed = edit_with_parse("df_safety_stock", ["product_name", "safety_stock", "current_stock"],
+                                        "safety_editor")
     st.session_state.df_safety_stock = pd.concat([edited, df_parsed], axis=1)
     st.write("#### 파싱된 안전재고 품목 정보")
     st.dataframe(df_parsed)
@@ -214,12 +291,18 @@ def page_slitting_calc():
     st.write("#### 안전재고 현황")
     st.dataframe(st.session_state.df_safety_stock)
 
+    timing.profile_button("coil_slitting")
     if st.button("슬리팅 계산 실행"):
-        st.session_state.slitting_result = solve_slitting(
-            st.session_state.df_coil_inventory,
-            st.session_state.df_safety_stock,
-            st.session_state.df_orders
-        )
+        tr = timing.start("coil_slitting", profile=timing.take_profile("coil_slitting"),
+                          lots=len(st.session_state.df_coil_inventory),
+                          orders=len(st.session_state.df_orders))
+        with timing.span("solve"):
+            st.session_state.slitting_result = solve_slitting(
+                st.session_state.df_coil_inventory,
+                st.session_state.df_safety_stock,
+                st.session_state.df_orders
+            )
+        timing.finish(tr)
         st.success("슬리팅 계산이 완료되었습니다.")
 
     if st.session_state.slitting_result:
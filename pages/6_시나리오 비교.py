@@ -0,0 +1,116 @@
+import re
+
+import streamlit as st
+import pandas as pd
+
+from core.bulk_import import import_once
+from core.parsers import parse_cut_list, parse_lot_list, parse_names, parse_orders
+from core.pipe import expand_pieces
+from core.sweep import pipe_sweep, slitting_sweep
+from core import timing
+
+st.set_page_config(page_title="시나리오 비교", page_icon="📊", layout="wide")
+st.title("📊 시나리오 비교 – 원자재 길이 · 코일 구성 · Filler 조합")
+st.caption("변형마다 최적화를 돌려 사용량 · 폐기량 · 세팅 수를 비교합니다. "
+           "⭐ 표시는 다른 변형에 모든 지표에서 밀리지 않는 후보(Pareto)입니다.")
+
+
+def numbers(text):
+    """"6000, 8000 12000" → [6000, 8000, 12000]"""
+    return sorted({int(float(x)) for x in re.split(r"[,\s/]+", text) if x.strip()})
+
+
+def show(df):
+    df = df.copy()
+    df.insert(0, "⭐", df.pop("pareto").map({True: "⭐", False: ""}))
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+
+tab_pipe, tab_coil = st.tabs(["🔩 파이프 절단", "🧻 코일 슬리팅"])
+
+# ───────────────── 파이프: 원자재 길이 × 척 길이 ─────────────────
+with tab_pipe:
+    upload = st.file_uploader("절단 리스트 (XLSX/CSV: Length(mm), Qty) – 없으면 파이프 절단 계산기 페이지의 리스트 사용",
+                              type=["xlsx", "csv"], key="sweep_cut_file")
+    cut = import_once(st.session_state, "sweep_cut_import", upload, parse_cut_list)
+    if cut is None:
+        base = st.session_state.get("cut_df", pd.DataFrame(columns=["Length(mm)", "Qty"]))
+        cut = parse_cut_list(st.data_editor(base.reset_index(drop=True), num_rows="dynamic", hide_index=True,
+                                            key="sweep_cut_editor"))
+    pieces = expand_pieces(cut["Length(mm)"], cut["Qty"]) if not cut.empty else []
+
+    c1, c2, c3 = st.columns(3)
+    stock_text = c1.text_input("원자재 길이 (mm, 쉼표 구분)", "6000, 8000, 12000")
+    chuck_text = c2.text_input("척 길이 (mm, 쉼표 구분)", "200, 300")
+    limit = c3.number_input("변형당 개선 시간 (초)", 0.0, 60.0, 2.0, 0.5)
+    reduce_setups = st.checkbox("세팅(패턴) 수 줄이기 적용", key="sweep_reduce")
+
+    try:
+        stock_lens, chuck_lens = numbers(stock_text), numbers(chuck_text)
+    except ValueError:
+        stock_lens = chuck_lens = []
+        st.error("길이는 숫자로 입력하세요.")
+
+    if st.button("▶ 파이프 시나리오 실행", disabled=not (pieces and stock_lens and chuck_lens)):
+        tr = timing.start("sweep_pipe", pieces=len(pieces), variants=len(stock_lens) * len(chuck_lens))
+        with st.spinner(f"{len(stock_lens) * len(chuck_lens)}개 변형 계산 중..."):
+            with timing.span("pipe_sweep"):
+                res = pipe_sweep(pieces, stock_lens, chuck_lens, limit, reduce_setups)
+        st.success(f"조각 {len(pieces):,}개 · 총 {sum(pieces) / 1000:,.1f} m")
+        show(res)
+        timing.finish(tr)
+
+# ───────────────── 슬리팅: 코일 구성 × Filler 조합 ─────────────────
+with tab_coil:
+    c1, c2, c3 = st.columns(3)
+    orders = import_once(st.session_state, "sweep_orders_import",
+                         c1.file_uploader("주문 (첫 열 품명, 둘째 열 kg 선택)", type=["xlsx", "csv"], key="sweep_orders"),
+                         parse_orders)
+    stock = import_once(st.session_state, "sweep_lots_import",
+                        c2.file_uploader("LOT (LOT_NO, weight, vendor)", type=["xlsx", "csv"], key="sweep_lots"),
+                        parse_lot_list)
+    fillers = import_once(st.session_state, "sweep_fillers_import",
+                          c3.file_uploader("Filler (첫 열 품명) – 선택", type=["xlsx", "csv"], key="sweep_fillers"),
+                          lambda c: parse_names(c.iloc[:, 0]))
+
+    st.markdown("**Filler 조합** – 한 줄에 하나, `이름: 품명, 품명, ...`")
+    sets_text = st.text_area("Filler 조합", "좁은 폭: 0.75Tx100, 0.6Tx100\n넓은 폭: 0.75Tx140, 0.6Tx140",
+                             label_visibility="collapsed")
+    o1, o2, o3 = st.columns(3)
+    no_filler = o1.checkbox("Filler 없이도 비교", value=True)
+    by_vendor = o2.checkbox("공급사별 코일 구성도 비교")
+    by = "kg" if o3.radio("수요 기준", ["스트립 개수", "중량(kg)"], horizontal=True, key="sweep_by") == "중량(kg)" \
+        else "count"
+    t1, t2 = st.columns(2)
+    tol = t1.number_input("폭 허용오차 (mm)", 0, 10, 0, key="sweep_tol")
+    coil_limit = t2.number_input("두께 그룹당 CBC 시간 (초)", 1, 600, 30)
+
+    filler_sets = []
+    if fillers is not None and not fillers.empty:
+        filler_sets.append(("업로드 전체", fillers))
+    for line in sets_text.splitlines():
+        name, _, items = line.partition(":") if ":" in line else ("", "", line)
+        names = [x.strip() for x in items.split(",") if x.strip()]
+        if names:
+            filler_sets.append((name.strip() or ", ".join(names), parse_names(pd.Series(names))))
+    if no_filler:
+        filler_sets.append(("없음", parse_names(pd.Series([], dtype=str))))
+
+    if orders is None or stock is None:
+        st.info("주문과 LOT 파일을 올리면 실행할 수 있습니다.")
+    else:
+        mixes = [("전체", stock)]
+        if by_vendor:
+            mixes += [(str(v), g) for v, g in stock.groupby("vendor", observed=True)]
+        scenarios = [(m, s, f, fl) for m, s in mixes for f, fl in filler_sets]
+        st.caption(f"주문 {len(orders):,}건 · LOT {len(stock):,}개 · 변형 {len(scenarios)}개")
+
+        if st.button("▶ 슬리팅 시나리오 실행", disabled=not scenarios):
+            tr = timing.start("sweep_slitting", orders=len(orders), variants=len(scenarios))
+            with st.spinner(f"{len(scenarios)}개 변형 계산 중..."):
+                with timing.span("slitting_sweep"):
+                    res = slitting_sweep(orders, scenarios, coil_limit, tol, by)
+            show(res)
+            if not res["verified"].all():
+                st.caption("verified = False: 해당 구성으로는 주문 수요를 다 채우지 못함 (Pareto 후보에서 제외)")
+            timing.finish(tr)
@@ -0,0 +1,267 @@
+"""
+최적화 로컬 HTTP 서비스 (ERP 등 외부 시스템 연동용)
+
+    python -m service.run --port 8600 --workers 4
+    curl -s localhost:8600/pipe -d '{"pieces": [[1200, 10], [850, 4]], "stock_len": 6000}'
+
+    POST /pipe          파이프 절단 계획
+    POST /slitting      코일 슬리팅 계획
+    POST /quote-weight  견적 중량 계산
+    GET  /health        캐시 · 대기열 상태
+
+– 요청 본문 형식은 core/api.py 참고. 응답은 JSON, 요청별 오류는 422 {"error": ...}
+– 같은 종류 요청이 짧은 시간(--window-ms) 안에 몰리면 묶어서 작업 프로세스 1회 호출로 처리
+– 최적화는 작업 프로세스 풀에서 실행 → 이벤트 루프는 막히지 않음
+– 같은 본문(JSON 정규화 기준)은 LRU 캐시 응답, 처리 중인 같은 요청은 결과를 공유
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+ROUTES = {"/pipe": "pipe", "/slitting": "slitting", "/quote-weight": "quote_weight"}
+# 한 번의 작업 프로세스 호출에 묶을 최대 요청 수 (슬리팅은 CBC가 무거워 묶지 않음)
+MAX_BATCH = {"pipe": 32, "slitting": 1, "quote_weight": 256}
+MAX_BODY = 8 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def _warm():
+    """작업 프로세스 시작 시 pandas · pulp 등 미리 import"""
+    import core.api  # noqa: F401
+
+
+def _run_batch(kind, payloads):
+    from core.api import run_batch
+    return run_batch(kind, payloads)
+
+
+def cache_key(kind, body):
+    """키 순서 · 공백과 무관한 요청 식별자"""
+    text = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return kind + ":" + hashlib.sha1(text.encode()).hexdigest()
+
+
+# -------------------------------------------------------------------
+# 1) LRU 캐시
+# -------------------------------------------------------------------
+class LRU:
+    def __init__(self, size):
+        self.size = size
+        self.data = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.size:
+            self.data.popitem(last=False)
+
+
+# -------------------------------------------------------------------
+# 2) 요청 묶기
+# -------------------------------------------------------------------
+class Batcher:
+    """
+    종류별 대기열. 첫 요청이 들어오면 window 동안 모은 뒤
+    작업 프로세스 수만큼 나눠(최대 MAX_BATCH개씩) 풀에 보낸다.
+    """
+
+    def __init__(self, kind, pool, workers, window):
+        self.kind, self.pool, self.workers, self.window = kind, pool, workers, window
+        self.queue = []      # (key, payload)
+        self.inflight = {}   # key → Future
+        self.flush_task = None
+        self.batches = self.requests = 0
+
+    def submit(self, key, payload):
+        fut = self.inflight.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self.inflight[key] = fut
+            self.queue.append((key, payload))
+            if self.flush_task is None:
+                self.flush_task = asyncio.create_task(self._flush())
+        return fut
+
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        items, self.queue, self.flush_task = self.queue, [], None
+        size = min(MAX_BATCH[self.kind], math.ceil(len(items) / self.workers))
+        await asyncio.gather(*(self._run(items[i:i + size]) for i in range(0, len(items), size)))
+
+    async def _run(self, items):
+        loop = asyncio.get_running_loop()
+        self.batches += 1
+        self.requests += len(items)
+        try:
+            results = await loop.run_in_executor(self.pool, _run_batch, self.kind, [p for _, p in items])
+        except Exception as e:
+            results = [e] * len(items)
+        for (key, _), res in zip(items, results):
+            fut = self.inflight.pop(key, None)
+            if fut is None or fut.done():
+                continue
+            if isinstance(res, Exception):
+                fut.set_exception(res)
+            else:
+                fut.set_result(res)
+
+
+# -------------------------------------------------------------------
+# 3) HTTP
+# -------------------------------------------------------------------
+class Service:
+    def __init__(self, workers, window_ms, cache_size):
+        self.pool = ProcessPoolExecutor(workers, initializer=_warm)
+        self.batchers = {k: Batcher(k, self.pool, workers, window_ms / 1000) for k in MAX_BATCH}
+        self.cache = LRU(cache_size)
+        self.started = time.time()
+
+    async def dispatch(self, method, path, body):
+        """→ (상태 코드, 응답 bytes, 캐시 적중 여부)"""
+        if path == "/health":
+            return 200, _dump(self.health()), False
+        kind = ROUTES.get(path)
+        if kind is None:
+            return 404, _dump({"error": f"unknown path {path}"}), False
+        if method != "POST":
+            return 405, _dump({"error": "use POST"}), False
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as e:
+            return 400, _dump({"error": f"invalid JSON: {e}"}), False
+        if not isinstance(payload, dict):
+            return 400, _dump({"error": "body must be a JSON object"}), False
+
+        key = cache_key(kind, payload)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return 200, hit, True
+        try:
+            # 공유 future – 이 요청 연결이 끊겨 취소돼도 같은 요청을 기다리는 쪽에는 영향 없음
+            result = await asyncio.shield(self.batchers[kind].submit(key, payload))
+        except Exception as e:
+            return 500, _dump({"error": f"{type(e).__name__}: {e}"}), False
+        if "error" in result:
+            return 422, _dump(result), False
+        data = _dump(result)
+        self.cache.put(key, data)
+        return 200, data, False
+
+    def health(self):
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "cache": {"entries": len(self.cache.data), "hits": self.cache.hits, "misses": self.cache.misses},
+            "batches": {k: {"calls": b.batches, "requests": b.requests, "queued": len(b.queue)}
+                        for k, b in self.batchers.items()},
+        }
+
+    async def handle(self, reader, writer):
+        """HTTP/1.1 keep-alive 연결 하나 (본문은 Content-Length만 지원)"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    await _respond(writer, 400, _dump({"error": "bad request line"}), close=True)
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _respond(writer, 400, _dump({"error": "bad Content-Length"}), close=True)
+                    break
+                if length > MAX_BODY:
+                    await _respond(writer, 413, _dump({"error": "body too large"}), close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                close = (headers.get("connection", "").lower() == "close"
+                         or (version == "HTTP/1.0" and headers.get("connection", "").lower() != "keep-alive"))
+
+                t0 = time.perf_counter()
+                status, data, hit = await self.dispatch(method.upper(), target.split("?")[0], body)
+                await _respond(writer, status, data, close,
+                               {"X-Cache": "hit" if hit else "miss",
+                                "X-Elapsed-Ms": f"{(time.perf_counter() - t0) * 1000:.1f}"})
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _dump(obj):
+    return json.dumps(obj, ensure_ascii=False).encode()
+
+
+async def _respond(writer, status, data, close=False, extra=None):
+    head = [f"HTTP/1.1 {status} {REASONS[status]}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(data)}",
+            f"Connection: {'close' if close else 'keep-alive'}"]
+    head += [f"{k}: {v}" for k, v in (extra or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+
+
+async def serve(host, port, workers, window_ms, cache_size):
+    svc = Service(workers, window_ms, cache_size)
+    server = await asyncio.start_server(svc.handle, host, port)
+    print(f"listening on http://{host}:{port}  (workers={workers}, window={window_ms}ms, cache={cache_size})",
+          flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        svc.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8600)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--window-ms", type=float, default=5.0, help="요청을 모으는 시간(ms)")
+    ap.add_argument("--cache", type=int, default=1024, help="LRU 캐시 항목 수 (0이면 끔)")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, max(1, args.workers), args.window_ms, args.cache))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())